@@ -0,0 +1,80 @@
+import os
+import sqlite3
+import threading
+import logging
+from datetime import datetime
+
+from .anomaly import Alert
+
+logger = logging.getLogger('alert_store')
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "alerts.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS alerts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    time TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    series TEXT NOT NULL,
+    level TEXT NOT NULL,
+    message TEXT NOT NULL,
+    observed REAL,
+    expected REAL
+);
+CREATE TABLE IF NOT EXISTS state (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+class AlertStore:
+    """SQLite hand-off between the single ingest process and the web workers.
+
+    The ingest process records alerts as the detector raises them and polls
+    the alerts switch; every worker reads recent alerts and writes the switch
+    from the settings page.
+    """
+
+    def __init__(self, db_path=None, max_alerts=1000):
+        self.db_path = db_path or os.getenv('ALERTS_DB', DEFAULT_DB_PATH)
+        self.max_alerts = max_alerts
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, timeout=10.0)
+        self.conn.row_factory = sqlite3.Row
+        # WAL lets workers read while the ingest process writes
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def close(self):
+        self.conn.close()
+
+    def record(self, alert):
+        """Store an alert; usable directly as an AnomalyDetector listener"""
+        with self._lock, self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO alerts (time, kind, series, level, message, observed, expected) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (alert.time.isoformat(), alert.kind, alert.series, alert.level, alert.message,
+                 alert.observed, alert.expected)
+            )
+            self.conn.execute("DELETE FROM alerts WHERE id <= ?", (cursor.lastrowid - self.max_alerts,))
+
+    def recent(self, limit=10):
+        """Most recent alerts first"""
+        with self._lock:
+            rows = self.conn.execute("SELECT * FROM alerts ORDER BY id DESC LIMIT ?", (limit,)).fetchall()
+        return [Alert(r['kind'], r['series'], r['observed'], r['expected'], r['message'], r['level'],
+                      datetime.fromisoformat(r['time'])) for r in rows]
+
+    def alerts_enabled(self, default=False):
+        with self._lock:
+            row = self.conn.execute("SELECT value FROM state WHERE key = 'alerts_enabled'").fetchone()
+        return default if row is None else row['value'] == '1'
+
+    def set_alerts_enabled(self, enabled):
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO state (key, value) VALUES ('alerts_enabled', ?)",
+                ('1' if enabled else '0',)
+            )
@@ -0,0 +1,255 @@
+import hashlib
+import logging
+import math
+import re
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime
+
+logger = logging.getLogger('anomaly')
+
+LEVELS = ['DEBUG', 'INFO', 'WARNING', 'ERROR', 'CRITICAL']
+ERROR_LEVELS = {'ERROR', 'CRITICAL'}
+LEVEL_ALIASES = {'WARN': 'WARNING', 'FATAL': 'CRITICAL'}
+MAX_UNKNOWN_LEVELS = 64
+
+def normalize_level(level):
+    """Upper-case a log level and map aliases such as FATAL onto LEVELS"""
+    level = str(level).upper()
+    return LEVEL_ALIASES.get(level, level)
+
+_TEMPLATE_PATTERNS = [
+    (re.compile(r'\b[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\b', re.I), '<uuid>'),
+    (re.compile(r'\b\d{1,3}(?:\.\d{1,3}){3}\b'), '<ip>'),
+    (re.compile(r'\b0x[0-9a-f]+\b|\b[0-9a-f]{12,}\b', re.I), '<hex>'),
+    (re.compile(r'"[^"]*"|\'[^\']*\''), '<str>'),
+    (re.compile(r'\d+(?:\.\d+)?'), '<num>'),
+]
+
+def log_template(message):
+    """Collapse variable parts of a log message so similar lines share a template"""
+    for pattern, placeholder in _TEMPLATE_PATTERNS:
+        message = pattern.sub(placeholder, message)
+    return message[:200]
+
+@dataclass
+class Alert:
+    kind: str
+    series: str
+    observed: float
+    expected: float
+    message: str
+    level: str = 'WARNING'
+    time: datetime = field(default_factory=datetime.now)
+
+    def to_event(self):
+        """Render in the dashboard's recentEvents format"""
+        return {
+            'time': self.time.strftime('%H:%M:%S'),
+            'type': self.level,
+            'message': self.message,
+            'status': 'danger' if self.level in ERROR_LEVELS else 'warning'
+        }
+
+class EWMA:
+    """Exponentially weighted mean and variance of one series, O(1) memory"""
+
+    __slots__ = ('alpha', 'mean', 'var', 'samples')
+
+    def __init__(self, alpha):
+        self.alpha = alpha
+        self.mean = 0.0
+        self.var = 0.0
+        self.samples = 0
+
+    def update(self, value):
+        if self.samples == 0:
+            self.mean = value
+        else:
+            delta = value - self.mean
+            self.mean += self.alpha * delta
+            self.var = (1 - self.alpha) * (self.var + self.alpha * delta * delta)
+        self.samples += 1
+
+    @property
+    def std(self):
+        return math.sqrt(self.var)
+
+class CountMinSketch:
+    """Fixed-size frequency table; estimates never undercount"""
+
+    def __init__(self, width=1024, depth=4):
+        self.width = width
+        self.depth = depth
+        self.rows = [[0.0] * width for _ in range(depth)]
+
+    def _cells(self, key):
+        digest = hashlib.blake2b(key.encode('utf-8'), digest_size=8 * self.depth).digest()
+        for row in range(self.depth):
+            yield row, int.from_bytes(digest[row * 8:(row + 1) * 8], 'little') % self.width
+
+    def add(self, key, count=1):
+        for row, col in self._cells(key):
+            self.rows[row][col] += count
+
+    def estimate(self, key):
+        return min(self.rows[row][col] for row, col in self._cells(key))
+
+    def decay_into(self, other, alpha):
+        """Fold this sketch into `other` as an EWMA baseline, cell by cell"""
+        for mine, theirs in zip(self.rows, other.rows):
+            for i, value in enumerate(mine):
+                theirs[i] += alpha * (value - theirs[i])
+
+    def clear(self):
+        for row in self.rows:
+            row[:] = [0.0] * self.width
+
+class AnomalyDetector:
+    """Online spike detection over the log ingest stream.
+
+    Records are counted in fixed windows of `interval` seconds. When a window
+    closes, per-level counts and the error rate are compared against their
+    EWMA baselines (alert above `threshold` standard deviations), and log
+    templates seen in the window are compared against an EWMA count-min
+    sketch baseline (alert above `template_factor` times baseline). Memory
+    is constant: a handful of floats per level plus two fixed sketches.
+    """
+
+    def __init__(self, interval=5.0, alpha=0.1, threshold=4.0, warmup=6, min_count=10,
+                 template_factor=5.0, max_window_templates=256, max_alerts=100,
+                 sketch_width=1024, sketch_depth=4):
+        self.interval = interval
+        self.alpha = alpha
+        self.threshold = threshold
+        self.warmup = warmup
+        self.min_count = min_count
+        self.template_factor = template_factor
+        self.max_window_templates = max_window_templates
+        self._enabled = True
+        self.level_rates = {level: EWMA(alpha) for level in LEVELS}
+        self.error_rate = EWMA(alpha)
+        self.template_counts = CountMinSketch(sketch_width, sketch_depth)
+        self.template_baseline = CountMinSketch(sketch_width, sketch_depth)
+        self.alerts = deque(maxlen=max_alerts)
+        self.listeners = []
+        # Records whose level is not in LEVELS, by level; kept out of the
+        # per-level baselines and the error rate rather than guessed at
+        self.unknown_levels = {}
+        self._window_end = None
+        self._level_counts = dict.fromkeys(LEVELS, 0)
+        self._window_templates = {}  # template -> level, bounded per window
+        self._windows = 0
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self):
+        return self._enabled
+
+    @enabled.setter
+    def enabled(self, value):
+        with self._lock:
+            if value and not self._enabled:
+                # Start a fresh window rather than replaying the disabled
+                # period as empty windows, which would drag baselines to zero
+                self._window_end = None
+                self.template_counts.clear()
+                self._level_counts = dict.fromkeys(LEVELS, 0)
+                self._window_templates = {}
+            self._enabled = bool(value)
+
+    def observe(self, records, now=None):
+        """Count a batch of parsed log records (e.g. a ShardedWatcher batch)"""
+        if not self._enabled:
+            return
+        now = time.time() if now is None else now
+        with self._lock:
+            self._advance(now)
+            for record in records:
+                level = normalize_level(record.get('level', 'INFO'))
+                if level in self._level_counts:
+                    self._level_counts[level] += 1
+                else:
+                    self._count_unknown(level)
+                template = log_template(record.get('message') or record.get('content', ''))
+                self.template_counts.add(template)
+                if template not in self._window_templates and len(self._window_templates) < self.max_window_templates:
+                    self._window_templates[template] = level
+
+    def _count_unknown(self, level):
+        if level in self.unknown_levels:
+            self.unknown_levels[level] += 1
+        elif len(self.unknown_levels) < MAX_UNKNOWN_LEVELS:
+            logger.warning(f"Unknown log level {level!r}, not counted towards level baselines")
+            self.unknown_levels[level] = 1
+
+    def tick(self, now=None):
+        """Close any finished windows even when no records arrive"""
+        if not self._enabled:
+            return
+        with self._lock:
+            self._advance(time.time() if now is None else now)
+
+    def _advance(self, now):
+        if self._window_end is None:
+            self._window_end = now + self.interval
+            return
+        while now >= self._window_end:
+            self._close_window()
+            self._window_end += self.interval
+            # After a long gap, skip straight to the current window
+            if now - self._window_end > self.interval * self.warmup:
+                self._window_end = now + self.interval
+
+    def _close_window(self):
+        total = sum(self._level_counts.values())
+        errors = sum(self._level_counts[level] for level in ERROR_LEVELS)
+        warmed_up = self._windows >= self.warmup
+
+        if warmed_up:
+            for level, count in self._level_counts.items():
+                self._check(self.level_rates[level], count, f"level:{level}",
+                            f"{level} volume spike: {count} in {self.interval:g}s",
+                            'ERROR' if level in ERROR_LEVELS else 'WARNING',
+                            floor=1.0, min_value=self.min_count)
+            if total >= self.min_count:
+                self._check(self.error_rate, errors / total, "error_rate",
+                            f"Error rate spike: {errors / total:.0%} of {total} events",
+                            'ERROR', floor=0.05, min_value=0)
+            for template, level in self._window_templates.items():
+                count = self.template_counts.estimate(template)
+                baseline = self.template_baseline.estimate(template)
+                if count >= self.min_count and count > self.template_factor * max(baseline, 1.0):
+                    self._raise(Alert('template', template, count, baseline,
+                                      f"Log template spike ({count:.0f} in {self.interval:g}s): {template[:120]}",
+                                      'ERROR' if level in ERROR_LEVELS else 'WARNING'))
+
+        for level, count in self._level_counts.items():
+            self.level_rates[level].update(count)
+        if total:
+            self.error_rate.update(errors / total)
+        self.template_counts.decay_into(self.template_baseline, self.alpha)
+        self.template_counts.clear()
+        self._level_counts = dict.fromkeys(LEVELS, 0)
+        self._window_templates = {}
+        self._windows += 1
+
+    def _check(self, series, value, name, message, level, floor, min_value):
+        # Floor the deviation so near-constant series still need a real jump
+        if value >= min_value and value > series.mean + self.threshold * max(series.std, floor):
+            self._raise(Alert('rate', name, value, series.mean, message, level))
+
+    def _raise(self, alert):
+        self.alerts.append(alert)
+        logger.warning(f"Anomaly detected: {alert.message}")
+        for listener in self.listeners:
+            try:
+                listener(alert)
+            except Exception as e:
+                logger.error(f"Alert listener failed: {str(e)}")
+
+    def recent_alerts(self, limit=10):
+        """Most recent alerts first"""
+        return list(self.alerts)[-limit:][::-1]
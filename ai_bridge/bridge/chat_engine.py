@@ -0,0 +1,116 @@
+import importlib
+import logging
+import weakref
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import SimpleNamespace
+
+logger = logging.getLogger('chat_engine')
+
+# Provider backends by mode, as "module:attribute". Modules are imported only
+# when a mode is first selected, so unused SDKs never load.
+PROVIDERS = {
+    "openai": "ai_bridge.bridge.openai_provider:OpenAIProvider",
+    "gpt4all": "ai_bridge.bridge.gpt4all_provider:GPT4AllProvider",
+}
+_loaded_providers = {}
+
+def register_provider(mode, target):
+    """Register a provider backend as a "module:attribute" path or a class"""
+    PROVIDERS[mode] = target
+    _loaded_providers.pop(mode, None)
+
+def load_provider(mode):
+    """Resolve the provider class for a mode, importing its module on first use"""
+    provider = _loaded_providers.get(mode)
+    if provider is not None:
+        return provider
+    if mode not in PROVIDERS:
+        raise ValueError(f"Unknown AI provider mode: {mode}")
+
+    target = PROVIDERS[mode]
+    if isinstance(target, str):
+        module_name, _, attribute = target.partition(":")
+        target = getattr(importlib.import_module(module_name), attribute)
+    _loaded_providers[mode] = target
+    return target
+
+@dataclass
+class ChatMessage:
+    role: str
+    content: str
+    timestamp: datetime = field(default_factory=datetime.now)
+
+    def to_dict(self):
+        return {"role": self.role, "content": self.content}
+
+class ProviderTimeout(Exception):
+    """Raised when a chat request cannot finish before its deadline"""
+class ChatEngine:
+    """Routes chat requests to the provider selected by `config.mode`.
+
+    Chats that pass a `session_id` keep their history in a ConversationStore
+    whose per-session token budget is `config.context_tokens` (the dashboard
+    maxTokens setting), so callers no longer resend the full history.
+    """
+
+    _instances = weakref.WeakSet()
+
+    def __init__(self, config):
+        self.config = SimpleNamespace(**config) if isinstance(config, dict) else config
+        self._provider = None
+        self._conversations = None
+        ChatEngine._instances.add(self)
+
+    @property
+    def provider(self):
+        # Created on first use so that forked workers each build their own
+        if self._provider is None:
+            self._provider = self._create_provider()
+        return self._provider
+
+    def _create_provider(self):
+        return load_provider(self.config.mode).from_config(self.config)
+
+    def switch_provider(self, mode, **options):
+        """Select another provider, importing its backend if not yet loaded"""
+        load_provider(mode)
+        for name, value in options.items():
+            setattr(self.config, name, value)
+        self.config.mode = mode
+        self._provider = None
+
+    @property
+    def conversations(self):
+        if self._conversations is None:
+            # Imported here: memory imports ChatMessage from this module
+            from .memory import ConversationStore
+
+            self._conversations = ConversationStore(
+                max_tokens=getattr(self.config, 'context_tokens', None) or 2048,
+                system_prompt=getattr(self.config, 'system_prompt', None)
+            )
+        return self._conversations
+
+    def reset(self):
+        """Drop the provider instance, e.g. in a worker right after fork"""
+        self._provider = None
+
+    @classmethod
+    def reset_all(cls):
+        """Reset every engine in this process (called post-fork)"""
+        for engine in list(cls._instances):
+            engine.reset()
+
+    async def chat(self, prompt, history=None, session_id=None):
+        if session_id is None:
+            messages = list(history or []) + [ChatMessage("user", prompt)]
+            return await self.provider.generate(messages)
+
+        conversation = self.conversations.get(session_id)
+        message = ChatMessage("user", prompt)
+        reply = await self.provider.generate(conversation.messages() + [message])
+        # Record the exchange only once it succeeded, so a failed request
+        # leaves no unanswered user turn in the session
+        conversation.add(message, ChatMessage("assistant", reply))
+        return reply
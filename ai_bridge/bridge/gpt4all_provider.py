@@ -0,0 +1,47 @@
+import asyncio
+import logging
+import os
+import threading
+
+from gpt4all import GPT4All
+
+logger = logging.getLogger('gpt4all_provider')
+
+class GPT4AllProvider:
+    """Local GPT4All model, loaded on first use in the serving process"""
+
+    def __init__(self, model_path, max_tokens=512, n_threads=None):
+        self.model_path = model_path
+        self.max_tokens = max_tokens
+        self.n_threads = n_threads
+        self._model = None
+        # GPT4All models are not safe to call from several threads at once
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            model_path=getattr(config, 'gpt4all_model_path', None) or getattr(config, 'model_path', None),
+            max_tokens=getattr(config, 'max_tokens', None) or 512
+        )
+
+    def _load(self):
+        if self._model is None:
+            logger.info(f"Loading GPT4All model from {self.model_path}")
+            self._model = GPT4All(
+                model_name=os.path.basename(self.model_path),
+                model_path=os.path.dirname(self.model_path) or None,
+                allow_download=False,
+                n_threads=self.n_threads
+            )
+        return self._model
+
+    def _generate(self, prompt, kwargs):
+        with self._lock:
+            return self._load().generate(prompt, max_tokens=self.max_tokens, **kwargs)
+
+    async def generate(self, messages, **kwargs):
+        """Return the model reply for a list of ChatMessage objects"""
+        prompt = "\n".join(f"{m.role}: {m.content}" for m in messages) + "\nassistant:"
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._generate, prompt, kwargs)
@@ -0,0 +1,138 @@
+import threading
+import time
+import logging
+from collections import OrderedDict, deque
+
+from .chat_engine import ChatMessage
+
+logger = logging.getLogger('memory')
+
+def estimate_tokens(text):
+    """Cheap token estimate, roughly four characters per token for English"""
+    return max(1, (len(text) + 3) // 4)
+
+def extractive_summary(previous, messages, max_chars):
+    """Fold evicted messages into the running summary without calling a model"""
+    lines = [previous] if previous else []
+    for message in messages:
+        first_line = message.content.strip().splitlines()[0] if message.content.strip() else ""
+        lines.append(f"{message.role}: {first_line[:160]}")
+    summary = "\n".join(lines)
+    # Keep the most recent context when the summary outgrows its budget
+    return summary[-max_chars:]
+
+class Conversation:
+    """Token-budgeted chat history for one session.
+
+    The prompt is always laid out as system prompt, rolling summary, then the
+    most recent messages. Once the budget is exceeded the oldest messages are
+    folded into the summary in one batch, down to `compact_ratio` of the
+    budget, so the prompt prefix stays byte-identical between compactions and
+    a local model can keep reusing its cached prefix.
+    """
+
+    def __init__(self, system_prompt=None, max_tokens=2048, compact_ratio=0.75,
+                 summary_max_tokens=256, token_counter=estimate_tokens, summarizer=None):
+        self.system_prompt = system_prompt
+        self.max_tokens = max_tokens
+        self.compact_ratio = compact_ratio
+        # The summary may never take more than a quarter of the budget
+        self.summary_max_tokens = min(summary_max_tokens, max_tokens // 4)
+        self.count_tokens = token_counter
+        self.summarizer = summarizer or (
+            lambda previous, messages: extractive_summary(previous, messages, self.summary_max_tokens * 4)
+        )
+        self.summary = ""
+        self.window = deque()  # (ChatMessage, token count) pairs
+        self.window_tokens = 0
+        self.fixed_tokens = self.count_tokens(system_prompt) if system_prompt else 0
+        self.summary_tokens = 0
+        self.last_active = time.monotonic()
+        self._lock = threading.Lock()
+
+    @property
+    def token_count(self):
+        return self.fixed_tokens + self.summary_tokens + self.window_tokens
+
+    def add(self, *messages):
+        """Append messages as one step, compacting older history if over budget"""
+        with self._lock:
+            for message in messages:
+                tokens = self.count_tokens(message.content)
+                self.window.append((message, tokens))
+                self.window_tokens += tokens
+            self.last_active = time.monotonic()
+            if self.token_count > self.max_tokens:
+                self._compact()
+
+    def _compact(self):
+        # Leave room for the summary to grow to its cap, so the prompt fits
+        # the target after compaction no matter what the summarizer returns
+        target = int(self.max_tokens * self.compact_ratio) - self.summary_max_tokens
+        evicted = []
+        # Always keep the latest message, even if it alone exceeds the budget
+        while len(self.window) > 1 and self.fixed_tokens + self.window_tokens > target:
+            message, tokens = self.window.popleft()
+            self.window_tokens -= tokens
+            evicted.append(message)
+        if not evicted:
+            return
+
+        summary = self.summarizer(self.summary, evicted)
+        tokens = self.count_tokens(summary) if summary else 0
+        while tokens > self.summary_max_tokens:
+            summary = summary[len(summary) - len(summary) * self.summary_max_tokens // tokens:]
+            tokens = self.count_tokens(summary) if summary else 0
+        self.summary = summary
+        self.summary_tokens = tokens
+        logger.debug(f"Compacted {len(evicted)} message(s) into summary ({self.summary_tokens} tokens)")
+
+    def messages(self):
+        """Return the prompt: system prompt, summary, then the recent window"""
+        prompt = []
+        if self.system_prompt:
+            prompt.append(ChatMessage("system", self.system_prompt))
+        with self._lock:
+            if self.summary:
+                prompt.append(ChatMessage("system", f"Summary of earlier conversation:\n{self.summary}"))
+            prompt.extend(message for message, _ in self.window)
+        return prompt
+
+class ConversationStore:
+    """Per-session conversations, evicting idle sessions in LRU order"""
+
+    def __init__(self, max_sessions=1000, idle_timeout=1800, **conversation_options):
+        self.max_sessions = max_sessions
+        self.idle_timeout = idle_timeout
+        self.conversation_options = conversation_options
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def get(self, session_id):
+        """Return the session's conversation, creating it if needed"""
+        with self._lock:
+            conversation = self._sessions.get(session_id)
+            if conversation is None:
+                conversation = Conversation(**self.conversation_options)
+                self._sessions[session_id] = conversation
+            else:
+                self._sessions.move_to_end(session_id)
+            conversation.last_active = time.monotonic()
+            self._evict()
+            return conversation
+
+    def drop(self, session_id):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def _evict(self):
+        cutoff = time.monotonic() - self.idle_timeout
+        while self._sessions:
+            session_id, conversation = next(iter(self._sessions.items()))
+            if len(self._sessions) <= self.max_sessions and conversation.last_active >= cutoff:
+                break
+            del self._sessions[session_id]
+            logger.debug(f"Evicted conversation {session_id}")
@@ -0,0 +1,226 @@
+import asyncio
+import atexit
+import logging
+import os
+import random
+import threading
+import time
+import weakref
+from email.utils import parsedate_to_datetime
+
+import httpx
+from openai import APIConnectionError, APIStatusError, AsyncOpenAI
+
+from .chat_engine import ChatMessage, ProviderTimeout
+
+logger = logging.getLogger('openai_provider')
+
+def _retry_after_seconds(value):
+    """Parse a Retry-After header given either as seconds or as an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+class _ClientLoop:
+    """Background event loop thread that owns one pooled OpenAI client.
+
+    httpx connections are bound to the loop that opened them, and the Flask
+    app drives coroutines with a fresh asyncio.run() per request. Running
+    every request on one long-lived loop lets them all share a single
+    keep-alive pool instead of building (and leaking) one per call.
+    """
+
+    def __init__(self, provider):
+        self.pid = os.getpid()
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, name='openai-client', daemon=True)
+        self.thread.start()
+        asyncio.run_coroutine_threadsafe(self._open(provider), self.loop).result()
+
+    async def _open(self, provider):
+        self.http_client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=provider.max_connections,
+                max_keepalive_connections=provider.max_connections,
+                keepalive_expiry=provider.keepalive_expiry
+            ),
+            timeout=httpx.Timeout(provider.timeout, connect=provider.connect_timeout)
+        )
+        self.client = AsyncOpenAI(
+            api_key=provider.api_key,
+            base_url=provider.base_url,
+            max_retries=0,  # Retries are handled by the provider
+            http_client=self.http_client
+        )
+        self.semaphore = asyncio.Semaphore(provider.max_concurrency)
+
+    def submit(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def close(self):
+        if self.thread.is_alive():
+            self.submit(self.http_client.aclose()).result()
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.thread.join()
+        self.loop.close()
+
+_open_providers = weakref.WeakSet()
+
+@atexit.register
+def _close_providers():
+    for provider in list(_open_providers):
+        provider.close()
+
+class OpenAIProvider:
+    """OpenAI chat completions over a shared keep-alive connection pool.
+
+    All requests run on one background event loop that owns the pooled
+    client, whichever loop (or asyncio.run call) they come from. Requests
+    are bounded by a semaphore, retried with jittered backoff on 429/5xx
+    (honouring Retry-After) and must complete, including time queued for
+    the semaphore, within `timeout` seconds overall. When `hedge_after` is
+    set, a duplicate request is fired if the first has not answered by then
+    and whichever finishes first wins.
+    """
+
+    def __init__(self, api_key, model="gpt-3.5-turbo", base_url=None,
+                 timeout=30.0, connect_timeout=5.0, max_retries=3,
+                 backoff_base=0.5, backoff_cap=8.0, max_connections=20,
+                 max_concurrency=16, keepalive_expiry=30.0, hedge_after=None):
+        self.api_key = api_key
+        self.model = model
+        self.base_url = base_url
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.max_connections = max_connections
+        self.max_concurrency = max_concurrency
+        self.keepalive_expiry = keepalive_expiry
+        self.hedge_after = hedge_after
+        self._client_loop = None
+        self._client_lock = threading.Lock()
+
+    # Tuning options read from `openai_<name>` config attributes when set
+    CONFIG_OPTIONS = ('timeout', 'connect_timeout', 'max_retries', 'max_connections',
+                      'max_concurrency', 'keepalive_expiry', 'hedge_after')
+
+    @classmethod
+    def from_config(cls, config):
+        options = {name: getattr(config, f'openai_{name}') for name in cls.CONFIG_OPTIONS
+                   if getattr(config, f'openai_{name}', None) is not None}
+        return cls(
+            api_key=getattr(config, 'openai_api_key', None) or os.getenv('OPENAI_API_KEY'),
+            model=getattr(config, 'openai_model', None) or "gpt-3.5-turbo",
+            base_url=getattr(config, 'openai_base_url', None),
+            **options
+        )
+
+    def _state(self):
+        # Threads do not survive fork, so a forked worker builds its own loop
+        with self._client_lock:
+            if self._client_loop is None or self._client_loop.pid != os.getpid():
+                self._client_loop = _ClientLoop(self)
+                _open_providers.add(self)
+            return self._client_loop
+
+    async def generate(self, messages, **kwargs):
+        """Return the assistant reply for a list of ChatMessage objects"""
+        payload = [m.to_dict() if isinstance(m, ChatMessage) else m for m in messages]
+        future = self._state().submit(self._generate(payload, kwargs))
+        return await asyncio.wrap_future(future)
+
+    async def _generate(self, payload, kwargs):
+        deadline = asyncio.get_running_loop().time() + self.timeout
+        if self.hedge_after is None:
+            return await self._with_retries(payload, deadline, kwargs)
+        return await self._hedged(payload, deadline, kwargs)
+
+    async def _hedged(self, payload, deadline, kwargs):
+        primary = asyncio.ensure_future(self._with_retries(payload, deadline, kwargs))
+        done, _ = await asyncio.wait({primary}, timeout=self.hedge_after)
+        if done:
+            return primary.result()
+
+        logger.debug("Primary request slow, sending hedged request")
+        pending = {primary, asyncio.ensure_future(self._with_retries(payload, deadline, kwargs))}
+        error = None
+        try:
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _with_retries(self, payload, deadline, kwargs):
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.max_retries + 1):
+            if deadline - loop.time() <= 0:
+                raise ProviderTimeout(f"OpenAI request exceeded {self.timeout}s deadline")
+
+            state = self._state()
+            retry_after = None
+            try:
+                try:
+                    await asyncio.wait_for(state.semaphore.acquire(), deadline - loop.time())
+                except asyncio.TimeoutError:
+                    raise ProviderTimeout(f"OpenAI request queued past its {self.timeout}s deadline")
+                try:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        raise ProviderTimeout(f"OpenAI request queued past its {self.timeout}s deadline")
+                    response = await state.client.chat.completions.create(
+                        model=self.model,
+                        messages=payload,
+                        timeout=remaining,
+                        **kwargs
+                    )
+                finally:
+                    state.semaphore.release()
+                return response.choices[0].message.content
+            except APIStatusError as e:
+                if e.status_code != 429 and e.status_code < 500:
+                    raise
+                if attempt == self.max_retries:
+                    raise
+                retry_after = _retry_after_seconds(e.response.headers.get('retry-after'))
+                logger.warning(f"OpenAI returned {e.status_code}, retrying (attempt {attempt + 1})")
+            except APIConnectionError as e:
+                if attempt == self.max_retries:
+                    raise
+                logger.warning(f"OpenAI connection error: {str(e)}, retrying (attempt {attempt + 1})")
+
+            delay = self._backoff(attempt, retry_after)
+            if loop.time() + delay >= deadline:
+                raise ProviderTimeout(f"OpenAI retry would exceed {self.timeout}s deadline")
+            await asyncio.sleep(delay)
+
+    def _backoff(self, attempt, retry_after=None):
+        """Full-jitter exponential backoff, never shorter than Retry-After"""
+        delay = random.uniform(0, min(self.backoff_cap, self.backoff_base * 2 ** attempt))
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    def close(self):
+        """Close the pooled client and stop its background loop"""
+        with self._client_lock:
+            client_loop, self._client_loop = self._client_loop, None
+        _open_providers.discard(self)
+        if client_loop is not None and client_loop.pid == os.getpid():
+            client_loop.close()
+
+    async def aclose(self):
+        await asyncio.get_running_loop().run_in_executor(None, self.close)
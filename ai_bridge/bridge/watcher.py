@@ -0,0 +1,297 @@
+import json
+import logging
+import multiprocessing
+import os
+import re
+import threading
+import time
+import zlib
+from multiprocessing.connection import wait
+from pathlib import Path
+
+from watchdog.events import FileSystemEventHandler
+from watchdog.observers import Observer
+
+from .anomaly import normalize_level
+
+logger = logging.getLogger('watcher')
+
+SUPPORTED_EXTENSIONS = {'.log', '.json', '.txt'}
+MAX_FILE_SIZE = 100 * 1024 * 1024  # Skip anything larger than 100 MB
+
+LEVEL_PATTERN = re.compile(r'\b(CRITICAL|FATAL|ERROR|WARN(?:ING)?|INFO|DEBUG)\b', re.IGNORECASE)
+
+def parse_line(file_path, line):
+    """Parse one log line (JSON or plain text) into a record dict"""
+    record = {'file_path': file_path, 'content': line, 'level': 'INFO', 'message': line}
+    if line.startswith('{'):
+        try:
+            data = json.loads(line)
+        except ValueError:
+            data = None
+        if isinstance(data, dict):
+            record['level'] = normalize_level(data.get('level', 'INFO'))
+            record['message'] = str(data.get('message', line))
+            record['timestamp'] = data.get('timestamp')
+            return record
+
+    match = LEVEL_PATTERN.search(line)
+    if match:
+        record['level'] = normalize_level(match.group(1))
+    return record
+
+class TailReader:
+    """Follows one file, returning only complete lines appended since last read"""
+
+    def __init__(self, path, from_start=True):
+        self.path = path
+        self.offset = 0 if from_start else self._size()
+        self.partial = b''
+
+    def _size(self):
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def read(self):
+        """Return (lines, bytes_read) for data written since the last call"""
+        size = self._size()
+        if size < self.offset:  # Truncated or rotated in place
+            self.offset = 0
+            self.partial = b''
+        if size == self.offset:
+            return [], 0
+
+        with open(self.path, 'rb') as f:
+            f.seek(self.offset)
+            data = f.read(size - self.offset)
+        self.offset += len(data)
+
+        chunks = (self.partial + data).split(b'\n')
+        self.partial = chunks.pop()
+        lines = [c.decode('utf-8', errors='replace').rstrip('\r') for c in chunks]
+        return [line for line in lines if line.strip()], len(data)
+
+class SmartLogHandler(FileSystemEventHandler):
+    """Tails supported log files and hands parsed records to the callback in batches"""
+
+    def __init__(self, callback, from_start=True):
+        self.callback = callback
+        self.from_start = from_start
+        self.readers = {}
+        self.bytes_read = 0
+        self._lock = threading.Lock()
+
+    def _should_process(self, path):
+        try:
+            return path.suffix in SUPPORTED_EXTENSIONS and path.stat().st_size <= MAX_FILE_SIZE
+        except OSError:
+            return False
+
+    def follow(self, path):
+        """Start tailing an existing file from its current end"""
+        if self._should_process(Path(path)):
+            with self._lock:
+                self.readers.setdefault(path, TailReader(path, from_start=False))
+
+    def _read(self, path, from_start):
+        if not self._should_process(Path(path)):
+            return
+        with self._lock:
+            reader = self.readers.get(path)
+            if reader is None:
+                reader = self.readers[path] = TailReader(path, from_start=from_start)
+            lines, size = reader.read()
+            self.bytes_read += size
+        if lines:
+            self.callback([parse_line(path, line) for line in lines])
+
+    def on_created(self, event):
+        if not event.is_directory:
+            self._read(event.src_path, from_start=True)
+
+    def on_modified(self, event):
+        if not event.is_directory:
+            self._read(event.src_path, from_start=self.from_start)
+
+    def on_moved(self, event):
+        if not event.is_directory:
+            with self._lock:
+                self.readers.pop(event.src_path, None)
+            self._read(event.dest_path, from_start=True)
+
+    def on_deleted(self, event):
+        with self._lock:
+            self.readers.pop(event.src_path, None)
+
+class FileWatcher:
+    """Watches one or more directories from a single observer thread"""
+
+    def __init__(self, path, callback, recursive=True, from_start=True):
+        self.paths = [path] if isinstance(path, (str, os.PathLike)) else list(path)
+        self.handler = SmartLogHandler(callback, from_start=from_start)
+        self.recursive = recursive
+        self.observer = None
+
+    def start(self):
+        self.observer = Observer()
+        for path in self.paths:
+            os.makedirs(path, exist_ok=True)
+            for file_path in Path(path).rglob('*') if self.recursive else Path(path).glob('*'):
+                if file_path.is_file():
+                    self.handler.follow(str(file_path))
+            self.observer.schedule(self.handler, str(path), recursive=self.recursive)
+        self.observer.start()
+
+    def stop(self):
+        if self.observer is not None:
+            self.observer.stop()
+            self.observer.join()
+            self.observer = None
+
+    def is_running(self):
+        return self.observer is not None and self.observer.is_alive()
+
+def shard_for(path, shards):
+    """Stable shard index for a watched directory"""
+    return zlib.crc32(os.path.abspath(path).encode('utf-8')) % shards
+
+def _shard_main(shard_id, paths, conn, stop_event, batch_size, flush_interval, from_start):
+    """Worker process: watch a shard's directories and ship record batches to the parent"""
+    buffer = []
+    oldest = [None]
+    buffer_lock = threading.Lock()
+
+    def collect(records):
+        with buffer_lock:
+            if not buffer:
+                oldest[0] = time.time()
+            buffer.extend(records)
+
+    watcher = FileWatcher(paths, collect, from_start=from_start)
+    watcher.start()
+    sent_bytes = 0
+    try:
+        while True:
+            stopping = stop_event.wait(flush_interval)
+            with buffer_lock:
+                batch = buffer[:]
+                read_at = oldest[0]
+                buffer.clear()
+            bytes_read = watcher.handler.bytes_read
+            for start in range(0, len(batch), batch_size):
+                conn.send((shard_id, batch[start:start + batch_size], bytes_read - sent_bytes, read_at))
+                sent_bytes = bytes_read
+            if stopping:
+                break
+    finally:
+        watcher.stop()
+        conn.close()
+
+class ShardedWatcher:
+    """Spreads many watched directories across worker processes.
+
+    Directories are hashed onto `shards` worker processes, each running its
+    own observer and tail readers. Workers send parsed records back over a
+    pipe in batches every `flush_interval` seconds, and `callback` is invoked
+    in the parent with each batch (a list of record dicts).
+    """
+
+    def __init__(self, paths, callback, shards=None, batch_size=1000, flush_interval=0.2,
+                 from_start=True):
+        self.callback = callback
+        self.shards = max(1, min(shards or os.cpu_count() or 1, len(paths) or 1))
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.from_start = from_start
+        self.assignments = [[] for _ in range(self.shards)]
+        for path in paths:
+            self.assignments[shard_for(path, self.shards)].append(path)
+        self._processes = []
+        self._receiver = None
+        self._stop_event = None
+        self._stats = []
+        self._stats_lock = threading.Lock()
+
+    def start(self):
+        # Spawn, not fork: the parent may be a threaded server holding locks
+        context = multiprocessing.get_context("spawn")
+        self._stop_event = context.Event()
+        self._stats = [{'shard': i, 'paths': len(paths), 'records': 0, 'bytes': 0,
+                        'lag_ms': 0.0, 'started_at': time.time()}
+                       for i, paths in enumerate(self.assignments)]
+        connections = []
+        for shard_id, paths in enumerate(self.assignments):
+            if not paths:
+                continue
+            parent_conn, child_conn = context.Pipe(duplex=False)
+            process = context.Process(
+                target=_shard_main,
+                args=(shard_id, paths, child_conn, self._stop_event, self.batch_size,
+                      self.flush_interval, self.from_start),
+                daemon=True
+            )
+            process.start()
+            child_conn.close()
+            self._processes.append(process)
+            connections.append(parent_conn)
+
+        self._receiver = threading.Thread(target=self._receive, args=(connections,), daemon=True)
+        self._receiver.start()
+        logger.info(f"Watching {sum(len(p) for p in self.assignments)} directories "
+                    f"across {len(self._processes)} shard(s)")
+
+    def _receive(self, connections):
+        while connections:
+            for conn in wait(connections):
+                try:
+                    shard_id, records, bytes_read, read_at = conn.recv()
+                except EOFError:
+                    connections.remove(conn)
+                    continue
+                with self._stats_lock:
+                    stats = self._stats[shard_id]
+                    stats['records'] += len(records)
+                    stats['bytes'] += bytes_read
+                    if read_at is not None:
+                        stats['lag_ms'] = (time.time() - read_at) * 1000
+                if records:
+                    try:
+                        self.callback(records)
+                    except Exception as e:
+                        logger.error(f"Watcher callback failed: {str(e)}")
+
+    def stop(self):
+        if self._stop_event is None:
+            return
+        self._stop_event.set()
+        for process in self._processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        if self._receiver is not None:
+            self._receiver.join(timeout=5)
+        self._processes = []
+        self._stop_event = None
+
+    def is_running(self):
+        return any(process.is_alive() for process in self._processes)
+
+    def stats(self):
+        """Per-shard totals, throughput and the lag of the latest batch"""
+        now = time.time()
+        with self._stats_lock:
+            report = []
+            for stats in self._stats:
+                elapsed = max(now - stats['started_at'], 1e-9)
+                report.append({
+                    'shard': stats['shard'],
+                    'paths': stats['paths'],
+                    'records': stats['records'],
+                    'bytes': stats['bytes'],
+                    'records_per_sec': stats['records'] / elapsed,
+                    'mb_per_sec': stats['bytes'] / elapsed / (1024 * 1024),
+                    'lag_ms': stats['lag_ms']
+                })
+            return report
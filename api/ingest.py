@@ -0,0 +1,82 @@
+"""Log ingest: watcher -> anomaly detector -> shared alert store.
+
+Exactly one ingest process may run per deployment, however many web workers
+serve the dashboard; they read its alerts from the AlertStore. gunicorn.conf.py
+starts it from the master, or run it standalone:
+
+    LOG_DIRS=/var/log/app1:/var/log/app2 python -m api.ingest
+"""
+import argparse
+import multiprocessing
+import os
+import signal
+import threading
+import logging
+
+logger = logging.getLogger('log_ingest')
+
+def log_dirs_from_env():
+    """Directories listed in LOG_DIRS, separated by os.pathsep"""
+    return [d for d in os.getenv('LOG_DIRS', '').split(os.pathsep) if d]
+
+def run_ingest(log_dirs, db_path=None, stop_event=None):
+    """Follow `log_dirs` until `stop_event` is set, recording alerts to the store"""
+    from ai_bridge.bridge.alert_store import AlertStore
+    from ai_bridge.bridge.anomaly import AnomalyDetector
+    from ai_bridge.bridge.watcher import ShardedWatcher
+    from api.settings import SETTINGS
+
+    store = AlertStore(db_path)
+    detector = AnomalyDetector()
+    detector.listeners.append(store.record)
+    detector.enabled = store.alerts_enabled(SETTINGS['enableAlerts'])
+    watcher = ShardedWatcher(log_dirs, detector.observe)
+    stop_event = stop_event or threading.Event()
+    watcher.start()
+    try:
+        while not stop_event.wait(detector.interval):
+            # The switch is flipped from the settings page in any web worker
+            detector.enabled = store.alerts_enabled(SETTINGS['enableAlerts'])
+            detector.tick()
+    finally:
+        watcher.stop()
+        store.close()
+
+def _ingest_main(log_dirs, db_path):
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+    try:
+        run_ingest(log_dirs, db_path, stop_event)
+    except KeyboardInterrupt:
+        pass
+
+def start_ingest_process(log_dirs, db_path=None):
+    """Run ingest in a dedicated process; stop it with stop_ingest_process()"""
+    # Not a daemon: the watcher starts shard processes of its own
+    context = multiprocessing.get_context("spawn")
+    process = context.Process(target=_ingest_main, args=(list(log_dirs), db_path), name='log-ingest')
+    process.start()
+    logger.info(f"Started log ingest process {process.pid} for {len(log_dirs)} directories")
+    return process
+
+def stop_ingest_process(process, timeout=10.0):
+    process.terminate()
+    process.join(timeout)
+    if process.is_alive():
+        logger.warning(f"Log ingest process {process.pid} did not stop, killing it")
+        process.kill()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('log_dirs', nargs='*', help='directories to follow (default: $LOG_DIRS)')
+    parser.add_argument('--db', help='alert store path (default: $ALERTS_DB)')
+    options = parser.parse_args()
+
+    log_dirs = options.log_dirs or log_dirs_from_env()
+    if not log_dirs:
+        parser.error("no log directories given and LOG_DIRS is not set")
+    logging.basicConfig(level=logging.INFO)
+    _ingest_main(log_dirs, options.db)
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,36 @@ import random
 
 bp = Blueprint('dashboard', __name__)
 
+_findings_store = None
+_alert_store = None
+
+def get_findings_store():
+    # Opened on first request so each gunicorn worker gets its own connection
+    global _findings_store
+    if _findings_store is None:
+        from security.findings_store import FindingsStore
+        _findings_store = FindingsStore()
+    return _findings_store
+
+def get_alert_store():
+    # Alerts come from the single ingest process (api.ingest) via SQLite
+    global _alert_store
+    if _alert_store is None:
+        from ai_bridge.bridge.alert_store import AlertStore
+        _alert_store = AlertStore()
+    return _alert_store
+
+def reset_singletons():
+    """Forget handles inherited from a parent process (called post-fork)"""
+    global _findings_store, _alert_store
+    _findings_store = None
+    _alert_store = None
+
 @bp.route('/api/dashboard-data')
 def dashboard_data():
     # Generate sample data (replace with real data from your system)
+    alerts = [alert.to_event() for alert in get_alert_store().recent()]
+    
     today = datetime.now()
     dates = [(today - timedelta(days=i)).strftime('%Y-%m-%d') for i in range(6, -1, -1)]
     
@@ -18,14 +45,33 @@ def dashboard_data():
         'events': [random.randint(50, 200) for _ in dates],
         'errors': [random.randint(0, 10) for _ in dates],
         'responseTimes': [random.randint(100, 500) for _ in dates],
-        'recentEvents': [
+        'recentEvents': alerts + [
             {
                 'time': (today - timedelta(minutes=i*5)).strftime('%H:%M:%S'),
                 'type': random.choice(['INFO', 'WARNING', 'ERROR']),
                 'message': f"Sample event message {i+1}",
                 'status': random.choice(['success', 'warning', 'danger'])
-            } for i in range(10)
-        ]
+            } for i in range(10 - len(alerts))
+        ],
+        'findings': get_findings_store().summary()
     }
     
     return jsonify(data)
+
+@bp.route('/api/findings')
+def findings():
+    store = get_findings_store()
+    source = request.args.get('source')
+    limit = min(request.args.get('limit', 100, type=int), 1000)
+    offset = request.args.get('offset', 0, type=int)
+    
+    # Diff view: new/fixed/unchanged since the source's previous run
+    if source and request.args.get('diff'):
+        return jsonify(store.diff(source, limit=limit, offset=offset))
+    
+    return jsonify(store.findings(
+        source=source,
+        severity=request.args.get('severity'),
+        limit=limit,
+        offset=offset
+    ))
@@ -1,8 +1,32 @@
+import threading
 from flask import Flask
+from api.ingest import log_dirs_from_env
 from api.routes import bp as dashboard_bp
+from api.settings import bp as settings_bp
 
-app = Flask(__name__)
-app.register_blueprint(dashboard_bp)
+def start_log_ingest(log_dirs):
+    """Run log ingest on a background thread, for single-process servers only"""
+    from api.ingest import run_ingest
+    thread = threading.Thread(target=run_ingest, args=(log_dirs,), name='log-ingest', daemon=True)
+    thread.start()
+    return thread
+
+def create_app(config=None):
+    app = Flask(__name__)
+    app.config['LOG_DIRS'] = log_dirs_from_env()
+    app.config.update(config or {})
+    app.register_blueprint(dashboard_bp)
+    app.register_blueprint(settings_bp)
+    
+    # Log ingest runs in exactly one process, not per worker: gunicorn starts
+    # it from the master (gunicorn.conf.py) and workers read the alert store
+    return app
+
+app = create_app()
 
 if __name__ == "__main__":
+    from werkzeug.serving import is_running_from_reloader
+    # With the reloader on, only the child process serves requests
+    if app.config['LOG_DIRS'] and is_running_from_reloader():
+        start_log_ingest(app.config['LOG_DIRS'])
     app.run(debug=True)
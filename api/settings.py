@@ -4,24 +4,29 @@ import random
 
 bp = Blueprint('settings', __name__)
 
+# Current settings (replace with persistence to your config)
+SETTINGS = {
+    'aiMode': 'gpt4all',
+    'modelPath': './models/mistral-7b-instruct.gguf',
+    'maxTokens': 2048,
+    'rateLimit': '100/hour',
+    'enableCors': True,
+    'apiAuth': True,
+    'logLevel': 'info',
+    'enableMetrics': True,
+    'enableAlerts': False
+}
+
 @bp.route('/api/settings', methods=['GET', 'POST'])
 def settings():
+    from api.routes import get_alert_store
     if request.method == 'GET':
-        # Return current settings (replace with actual settings from your config)
-        return jsonify({
-            'aiMode': 'gpt4all',
-            'modelPath': './models/mistral-7b-instruct.gguf',
-            'maxTokens': 2048,
-            'rateLimit': '100/hour',
-            'enableCors': True,
-            'apiAuth': True,
-            'logLevel': 'info',
-            'enableMetrics': True,
-            'enableAlerts': False
-        })
+        # The alerts switch is shared by every worker and the ingest process
+        return jsonify(dict(SETTINGS, enableAlerts=get_alert_store().alerts_enabled(SETTINGS['enableAlerts'])))
     
     elif request.method == 'POST':
         # Update settings
-        settings = request.get_json()
-        # Here you would actually save these settings to your config
+        settings = request.get_json() or {}
+        SETTINGS.update({k: v for k, v in settings.items() if k in SETTINGS})
+        get_alert_store().set_alerts_enabled(bool(SETTINGS['enableAlerts']))
         return jsonify({'message': 'Settings updated successfully'}), 200
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Measure cold import time of the API server with `python -X importtime`.
+
+Fails when importing exceeds the budget or pulls in a provider SDK, e.g.:
+
+    python benchmarks/bench_importtime.py --budget-ms 300
+"""
+import argparse
+import os
+import subprocess
+import sys
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger('bench_importtime')
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Provider SDKs must only load once a provider is selected
+LAZY_MODULES = ['openai', 'gpt4all', 'httpx']
+
+def measure_import(module):
+    """Return (total_ms, {module: cumulative_ms}, loaded_lazy_modules) for a fresh import"""
+    code = (f"import sys, {module}; "
+            f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_ROOT, capture_output=True, text=True, check=True
+    )
+
+    # Lines look like "import time:   self [us] | cumulative | imported package"
+    cumulative = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative_us, name = line[len("import time:"):].split("|")
+        if not name.startswith("  "):  # Top-level imports only
+            cumulative[name.strip()] = int(cumulative_us) / 1000
+
+    loaded = [m for m in result.stdout.strip().split(",") if m]
+    return sum(cumulative.values()), cumulative, loaded
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--module', default='api.server')
+    parser.add_argument('--budget-ms', type=float, default=300.0)
+    parser.add_argument('--top', type=int, default=10)
+    options = parser.parse_args()
+
+    total_ms, cumulative, loaded = measure_import(options.module)
+    logger.info(f"import {options.module}: {total_ms:.1f} ms (budget {options.budget_ms:.0f} ms)")
+    for name, ms in sorted(cumulative.items(), key=lambda item: -item[1])[:options.top]:
+        logger.info(f"  {ms:8.1f} ms  {name}")
+
+    failed = False
+    if loaded:
+        logger.error(f"Provider modules imported eagerly: {', '.join(loaded)}")
+        failed = True
+    if total_ms > options.budget_ms:
+        logger.error(f"Import time {total_ms:.1f} ms exceeds budget of {options.budget_ms:.0f} ms")
+        failed = True
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
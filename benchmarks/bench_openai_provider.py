@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""Compare chat latency of per-call clients against the pooled OpenAIProvider.
+
+Runs against benchmarks/mock_openai.py with the same task mix concurrency as
+the Locust /chat scenario, e.g.:
+
+    python benchmarks/bench_openai_provider.py --users 50 --requests 20
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from openai import AsyncOpenAI
+
+from ai_bridge.bridge.chat_engine import ChatMessage
+from ai_bridge.bridge.openai_provider import OpenAIProvider
+from benchmarks import mock_openai
+
+logging.basicConfig(level=logging.INFO)
+logging.getLogger('httpx').setLevel(logging.WARNING)  # One line per request otherwise
+logger = logging.getLogger('bench_openai_provider')
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+async def fresh_client_call(base_url, messages):
+    """Baseline: a new client, and so a new connection, for every request"""
+    client = AsyncOpenAI(api_key="mock", base_url=base_url)
+    try:
+        response = await client.chat.completions.create(
+            model="mock", messages=[m.to_dict() for m in messages]
+        )
+        return response.choices[0].message.content
+    finally:
+        await client.close()
+
+async def run_load(call, users, requests_per_user):
+    latencies = []
+
+    async def user(index):
+        messages = [ChatMessage("user", f"Test prompt from user {index}")]
+        for _ in range(requests_per_user):
+            start = time.perf_counter()
+            await call(messages)
+            latencies.append(time.perf_counter() - start)
+
+    await asyncio.gather(*(user(i) for i in range(users)))
+    return latencies
+
+async def run_benchmarks(options, base_url):
+    scenarios = {
+        'fresh-client': lambda messages: fresh_client_call(base_url, messages),
+    }
+    pooled = OpenAIProvider("mock", model="mock", base_url=base_url,
+                            max_connections=options.users, max_concurrency=options.users)
+    hedged = OpenAIProvider("mock", model="mock", base_url=base_url,
+                            max_connections=options.users * 2, max_concurrency=options.users * 2,
+                            hedge_after=options.hedge_after)
+    scenarios['pooled'] = pooled.generate
+    scenarios['pooled+hedged'] = hedged.generate
+
+    results = {}
+    for name, call in scenarios.items():
+        latencies = await run_load(call, options.users, options.requests)
+        results[name] = {
+            'p50_ms': percentile(latencies, 50) * 1000,
+            'p95_ms': percentile(latencies, 95) * 1000,
+            'p99_ms': percentile(latencies, 99) * 1000,
+        }
+        logger.info(f"{name:>14}: p50={results[name]['p50_ms']:.1f}ms "
+                    f"p95={results[name]['p95_ms']:.1f}ms p99={results[name]['p99_ms']:.1f}ms")
+
+    await pooled.aclose()
+    await hedged.aclose()
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--users', type=int, default=20)
+    parser.add_argument('--requests', type=int, default=20, help='requests per user')
+    parser.add_argument('--hedge-after', type=float, default=0.1)
+    parser.add_argument('--port', type=int, default=8765)
+    options = parser.parse_args()
+
+    server = mock_openai.start_server(mock_openai.parse_args(['--port', str(options.port)]))
+    try:
+        asyncio.run(run_benchmarks(options, f"http://127.0.0.1:{options.port}/v1"))
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
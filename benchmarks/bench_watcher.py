@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""Measure ShardedWatcher ingest throughput as the number of shards grows.
+
+Writes synthetic log lines into many directories and reports records/s and
+MB/s per shard count, e.g.:
+
+    python benchmarks/bench_watcher.py --directories 200 --lines 2000 --shards 1 2 4 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+import logging
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_bridge.bridge.watcher import ShardedWatcher
+from benchmarks.synthetic import synthetic_lines
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger('bench_watcher')
+
+def write_logs(directories, lines_per_dir, files_per_dir=2):
+    """Append synthetic lines to every directory; returns total bytes written"""
+    total = 0
+    for index, directory in enumerate(directories):
+        lines = list(synthetic_lines(lines_per_dir, seed=index))
+        chunk = len(lines) // files_per_dir
+        for f_index in range(files_per_dir):
+            data = "".join(lines[f_index * chunk:(f_index + 1) * chunk])
+            with open(os.path.join(directory, f"app{f_index}.log"), 'a') as f:
+                f.write(data)
+            total += len(data)
+    return total
+
+def run_ingest(directories, lines_per_dir, shards, files_per_dir=2, timeout=120):
+    """Return (records, seconds, bytes) for one ingest run"""
+    expected = len(directories) * (lines_per_dir // files_per_dir) * files_per_dir
+    received = [0]
+    done = threading.Event()
+
+    def callback(records):
+        received[0] += len(records)
+        if received[0] >= expected:
+            done.set()
+
+    watcher = ShardedWatcher(directories, callback, shards=shards, flush_interval=0.05)
+    watcher.start()
+    try:
+        time.sleep(1.0)  # Let observers settle before writing
+        start = time.perf_counter()
+        total_bytes = write_logs(directories, lines_per_dir, files_per_dir)
+        done.wait(timeout)
+        elapsed = time.perf_counter() - start
+        for shard in watcher.stats():
+            logger.debug(f"  shard {shard['shard']}: {shard['records']} records, lag {shard['lag_ms']:.1f} ms")
+    finally:
+        watcher.stop()
+    return received[0], elapsed, total_bytes
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--directories', type=int, default=100)
+    parser.add_argument('--lines', type=int, default=1000, help='lines per directory')
+    parser.add_argument('--shards', type=int, nargs='+', default=[1, 2, 4])
+    options = parser.parse_args()
+
+    baseline = None
+    for shards in options.shards:
+        with tempfile.TemporaryDirectory() as root:
+            directories = [os.path.join(root, f"service{i}") for i in range(options.directories)]
+            for directory in directories:
+                os.makedirs(directory)
+            records, elapsed, total_bytes = run_ingest(directories, options.lines, shards)
+
+        rate = records / elapsed
+        baseline = baseline or rate
+        logger.info(f"shards={shards:<3} {records} records in {elapsed:.2f}s: {rate:,.0f} rec/s, "
+                    f"{total_bytes / elapsed / (1024 * 1024):.1f} MB/s, speedup {rate / baseline:.2f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+"""Headless benchmark variant of tests/locustfile.py.
+
+The shared scenarios wait 1-5 s between tasks to mimic real users, which
+makes throughput and tail latency measure think time. Here users fire
+their next task as soon as the previous one returns.
+"""
+import os
+import sys
+
+from locust import constant
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "tests"))
+
+# Imported as a module so Locust does not also pick up the original user class
+import locustfile as scenarios
+
+class BenchmarkUser(scenarios.AIBridgeUser):
+    wait_time = constant(0)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""Minimal OpenAI-compatible chat completions server for offline benchmarks"""
+import argparse
+import json
+import random
+import threading
+import time
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger('mock_openai')
+
+class MockOpenAIHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # Keep-alive, like the real API
+    # Headers and body go out in separate writes; without this Nagle and
+    # delayed ACKs add ~40ms to every keep-alive response
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, status, body, headers=None):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        try:
+            self.end_headers()
+            self.wfile.write(data)
+        except (BrokenPipeError, ConnectionResetError):
+            # The client gave up, e.g. a hedged request that lost the race
+            self.close_connection = True
+
+    def do_POST(self):
+        length = int(self.headers.get('Content-Length', 0))
+        request = json.loads(self.rfile.read(length) or b'{}')
+        if not self.path.endswith('/chat/completions'):
+            self._send_json(404, {'error': {'message': 'Not found'}})
+            return
+
+        opts = self.server.options
+        if random.random() < opts.error_rate:
+            self._send_json(429, {'error': {'message': 'Rate limit reached', 'type': 'rate_limit'}},
+                            {'Retry-After': str(opts.retry_after)})
+            return
+
+        latency = opts.tail_latency if random.random() < opts.tail_rate else opts.latency
+        time.sleep(latency)
+
+        prompt = request.get('messages', [{}])[-1].get('content', '')
+        self._send_json(200, {
+            'id': 'chatcmpl-mock',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': request.get('model', 'mock'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': f"Mock reply to: {prompt[:64]}"},
+                'finish_reason': 'stop'
+            }],
+            'usage': {'prompt_tokens': len(prompt.split()), 'completion_tokens': 4,
+                      'total_tokens': len(prompt.split()) + 4}
+        })
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=0.02, help='typical response time in seconds')
+    parser.add_argument('--tail-latency', type=float, default=0.5, help='response time of slow requests')
+    parser.add_argument('--tail-rate', type=float, default=0.02, help='fraction of slow requests')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='fraction of 429 responses')
+    parser.add_argument('--retry-after', type=float, default=0.05, help='Retry-After sent with 429s')
+    return parser.parse_args(argv)
+
+def make_server(options):
+    server = ThreadingHTTPServer((options.host, options.port), MockOpenAIHandler)
+    server.daemon_threads = True
+    server.options = options
+    return server
+
+def start_server(options):
+    """Start the mock server on a daemon thread and return it"""
+    server = make_server(options)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def main():
+    options = parse_args()
+    server = make_server(options)
+    logger.info(f"Mock OpenAI server listening on http://{options.host}:{options.port}/v1")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Offline stand-ins for AI providers and the AI Bridge API used by benchmarks"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_bridge.bridge.chat_engine import ChatEngine, register_provider
+
+class MockProvider:
+    """Echoes the prompt back after a fixed simulated model latency"""
+
+    def __init__(self, latency=0.01):
+        self.latency = latency
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(latency=getattr(config, 'mock_latency', 0.01))
+
+    async def generate(self, messages, **kwargs):
+        await asyncio.sleep(self.latency)
+        return f"Mock reply to: {messages[-1].content[:64]}"
+
+register_provider("mock", MockProvider)
+
+def create_mock_app(latency=0.01, openai_base_url=None, hedge_after=None):
+    """The real Flask app plus /chat, /status and /switch-provider on a mock provider.
+
+    With `openai_base_url` (e.g. a benchmarks/mock_openai.py server), /chat
+    goes through the real OpenAIProvider instead of MockProvider.
+    """
+    from flask import Blueprint, jsonify, request
+    from api.server import create_app
+    from api.settings import SETTINGS
+
+    config = {"mode": "mock", "mock_latency": latency, "context_tokens": SETTINGS['maxTokens']}
+    if openai_base_url:
+        config.update(mode="openai", openai_api_key="mock", openai_model="mock",
+                      openai_base_url=openai_base_url, openai_hedge_after=hedge_after)
+    engine = ChatEngine(config)
+    bp = Blueprint('mock_bridge', __name__)
+
+    @bp.route('/health')
+    def health():
+        return jsonify({'status': 'healthy'})
+
+    @bp.route('/status')
+    def status():
+        return jsonify({'status': 'ok', 'mode': engine.config.mode})
+
+    @bp.route('/chat', methods=['POST'])
+    def chat():
+        data = request.get_json() or {}
+        reply = asyncio.run(engine.chat(data.get('prompt', ''), session_id=data.get('session_id')))
+        return jsonify({'response': reply})
+
+    @bp.route('/switch-provider', methods=['POST'])
+    def switch_provider():
+        # Real providers need keys or models, so every mode maps to the mock
+        mode = (request.get_json() or {}).get('mode', 'mock')
+        return jsonify({'message': f"Switched to {mode}", 'mode': engine.config.mode})
+
+    app = create_app({"testing": True})
+    app.register_blueprint(bp)
+    return app
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""Run the tests/locustfile.py scenarios headless against a local mock of the AI Bridge API.
+
+Users run without the scenarios' think time (see benchmarks/locust_bench.py),
+so the stats measure the server rather than the wait between tasks.
+
+The mock serves the real dashboard routes plus /chat, /status and
+/switch-provider backed by a mock provider, so no keys or models are needed.
+With --provider openai, /chat runs through the real OpenAIProvider against
+benchmarks/mock_openai.py instead:
+
+    python benchmarks/run_locust.py --users 50 --duration 60s
+    python benchmarks/run_locust.py --provider openai --hedge-after 0.1
+"""
+import argparse
+import csv
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import threading
+import logging
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, PROJECT_ROOT)
+
+logging.basicConfig(level=logging.INFO)
+logging.getLogger('httpx').setLevel(logging.WARNING)  # One line per request otherwise
+logger = logging.getLogger('run_locust')
+
+LOCUSTFILE = os.path.join(BENCH_DIR, "locust_bench.py")
+
+def start_mock_bridge(latency, port=0, openai_base_url=None, hedge_after=None):
+    """Serve the mock bridge on a background thread; returns (server, base_url)"""
+    from werkzeug.serving import make_server
+    from benchmarks.mocks import create_mock_app
+
+    app = create_mock_app(latency=latency, openai_base_url=openai_base_url, hedge_after=hedge_after)
+    server = make_server("127.0.0.1", port, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_port}"
+
+def read_aggregate(stats_csv):
+    """Pull throughput, failures and p99 from Locust's aggregated stats row"""
+    with open(stats_csv, newline='') as f:
+        for row in csv.DictReader(f):
+            if row['Name'] == 'Aggregated':
+                return {
+                    'requests': int(row['Request Count']),
+                    'failures': int(row['Failure Count']),
+                    'rps': float(row['Requests/s']),
+                    'p50_ms': float(row['50%']),
+                    'p99_ms': float(row['99%'])
+                }
+    raise ValueError(f"No aggregated row in {stats_csv}")
+
+def run_locust(users=16, spawn_rate=None, duration="30s", latency=0.005, provider="mock",
+               hedge_after=None):
+    """Run the Locust scenarios headless and return the aggregated stats"""
+    # Locust runs in a subprocess, so check for it up front: callers such
+    # as benchmarks/suite.py skip benchmarks on ImportError
+    if importlib.util.find_spec("locust") is None:
+        raise ImportError("No module named 'locust'")
+    db_dir = tempfile.mkdtemp()
+    os.environ.setdefault('FINDINGS_DB', os.path.join(db_dir, "findings.db"))
+    os.environ.setdefault('ALERTS_DB', os.path.join(db_dir, "alerts.db"))
+    openai_server = openai_base_url = None
+    if provider == "openai":
+        from benchmarks import mock_openai
+        openai_server = mock_openai.start_server(
+            mock_openai.parse_args(['--port', '0', '--latency', str(latency)])
+        )
+        openai_base_url = f"http://127.0.0.1:{openai_server.server_port}/v1"
+    server, base_url = start_mock_bridge(latency, openai_base_url=openai_base_url, hedge_after=hedge_after)
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            prefix = os.path.join(tmp, "locust")
+            # Locust exits non-zero when requests fail; failures are reported instead
+            result = subprocess.run([
+                sys.executable, "-m", "locust",
+                "-f", LOCUSTFILE,
+                "--headless",
+                "--users", str(users),
+                "--spawn-rate", str(spawn_rate or users),
+                "--run-time", duration,
+                "--host", base_url,
+                "--csv", prefix,
+                "--only-summary"
+            ], cwd=PROJECT_ROOT)
+            if not os.path.exists(f"{prefix}_stats.csv"):
+                raise RuntimeError(f"Locust exited with code {result.returncode} without writing stats")
+            return read_aggregate(f"{prefix}_stats.csv")
+    finally:
+        server.shutdown()
+        if openai_server is not None:
+            openai_server.shutdown()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--users', type=int, default=16)
+    parser.add_argument('--spawn-rate', type=float)
+    parser.add_argument('--duration', default='30s')
+    parser.add_argument('--latency', type=float, default=0.005, help='mock provider latency in seconds')
+    parser.add_argument('--provider', choices=['mock', 'openai'], default='mock',
+                        help='serve /chat from MockProvider or from OpenAIProvider against mock_openai')
+    parser.add_argument('--hedge-after', type=float, help='OpenAIProvider hedging delay in seconds')
+    options = parser.parse_args()
+
+    stats = run_locust(options.users, options.spawn_rate, options.duration, options.latency,
+                       options.provider, options.hedge_after)
+    logger.info(json.dumps(stats, indent=2))
+
+if __name__ == "__main__":
+    main()
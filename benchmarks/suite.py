@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""Offline benchmark suite and regression gate for the AI Bridge hot paths.
+
+Every benchmark runs locally against synthetic logs and a mock provider, so
+no server or API keys are needed. Results are written as JSON and compared
+against the baseline: the run fails if any metric regresses by more than
+--threshold (default 20%), if a selected benchmark did not produce a metric
+the baseline has (e.g. it was skipped for a missing dependency), or if there
+is no baseline. Baselines are machine specific: record one on the machine
+that runs the gate.
+
+    python benchmarks/suite.py --save-baseline     # record benchmarks/baseline.json
+    python benchmarks/suite.py                     # compare against it
+    python benchmarks/suite.py --only ingest api --locust
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+
+from benchmarks.synthetic import synthetic_log
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger('bench_suite')
+
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, "results", "latest.json")
+
+def metric(value, unit, better):
+    return {'value': round(value, 3), 'unit': unit, 'better': better}
+
+def best_of(repeats, func):
+    """Fastest wall time of `repeats` runs, to damp scheduler noise"""
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def percentiles(samples):
+    """Return the (p50, p99) of a list of samples"""
+    ordered = sorted(samples)
+    return tuple(ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))] for pct in (50, 99))
+
+def bench_ingest(options):
+    """Watcher tail reading and line parsing throughput"""
+    from ai_bridge.bridge.watcher import TailReader, parse_line
+
+    body = synthetic_log(options.log_mb * 1024 * 1024)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "app.log")
+        with open(path, 'w') as f:
+            f.write(body)
+
+        def ingest():
+            lines, _ = TailReader(path).read()
+            for line in lines:
+                parse_line(path, line)
+
+        seconds = best_of(options.repeats, ingest)
+    return {'watcher_ingest': metric(len(body) / seconds / (1024 * 1024), 'MB/s', 'higher')}
+
+def bench_classify(options):
+    """Level and template classification throughput of the anomaly detector"""
+    from ai_bridge.bridge.anomaly import AnomalyDetector
+    from ai_bridge.bridge.watcher import parse_line
+
+    body = synthetic_log(options.log_mb * 1024 * 1024)
+    records = [parse_line("app.log", line) for line in body.splitlines()]
+    batches = [records[i:i + 1000] for i in range(0, len(records), 1000)]
+
+    def classify():
+        detector = AnomalyDetector()
+        for batch in batches:
+            detector.observe(batch, now=0.0)
+
+    seconds = best_of(options.repeats, classify)
+    return {'detector_classify': metric(len(body) / seconds / (1024 * 1024), 'MB/s', 'higher')}
+
+def _http_latency(client_factory, method, url, body, concurrency, requests):
+    def worker(_):
+        client = client_factory()
+        timings = []
+        for _ in range(requests // concurrency):
+            start = time.perf_counter()
+            response = getattr(client, method)(url, json=body) if body else getattr(client, method)(url)
+            timings.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.status_code
+        return timings
+
+    with ThreadPoolExecutor(concurrency) as executor:
+        samples = [t for timings in executor.map(worker, range(concurrency)) for t in timings]
+    return percentiles(samples)
+
+def bench_api(options):
+    """/chat and /api/dashboard-data latency under concurrent clients"""
+    db_dir = tempfile.mkdtemp()
+    os.environ.setdefault('FINDINGS_DB', os.path.join(db_dir, "findings.db"))
+    os.environ.setdefault('ALERTS_DB', os.path.join(db_dir, "alerts.db"))
+    from benchmarks.mocks import create_mock_app
+
+    app = create_mock_app(latency=options.mock_latency)
+    results = {}
+    for name, method, url, body in [
+        ('chat', 'post', '/chat', {'prompt': 'Summarize the last hour of errors'}),
+        ('dashboard_data', 'get', '/api/dashboard-data', None),
+    ]:
+        p50, p99 = _http_latency(app.test_client, method, url, body,
+                                 options.concurrency, options.requests)
+        results[f'{name}_p50'] = metric(p50 * 1000, 'ms', 'lower')
+        results[f'{name}_p99'] = metric(p99 * 1000, 'ms', 'lower')
+    return results
+
+def bench_cache(options):
+    """Cache hit paths: unchanged-tree scan check and conversation lookup"""
+    from ai_bridge.bridge.chat_engine import ChatMessage
+    from ai_bridge.bridge.memory import ConversationStore
+    sys.path.insert(0, os.path.join(os.path.dirname(BENCH_DIR), 'security'))
+    from scan_cache import ScanCache
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for i in range(options.files):
+            package = os.path.join(tmp, f"pkg{i % 20}")
+            os.makedirs(package, exist_ok=True)
+            with open(os.path.join(package, f"module{i}.py"), 'w') as f:
+                f.write(f"def handler_{i}(request):\n    return request\n" * 20)
+        cache = ScanCache(tmp)
+        sources = cache.python_sources(tmp)
+        cache.update_findings(sources, list(sources), [], [])
+
+        def scan_hit():
+            changed, removed = cache.diff_sources(cache.python_sources(tmp))
+            assert not changed and not removed
+
+        seconds = best_of(options.repeats, scan_hit)
+    results['scan_cache_hit'] = metric(seconds * 1000, 'ms', 'lower')
+
+    store = ConversationStore(max_sessions=1000)
+    for i in range(1000):
+        store.get(f"session{i}").add(ChatMessage("user", "hello " * 20))
+    lookups = 100000
+    seconds = best_of(options.repeats, lambda: [store.get(f"session{i % 1000}") for i in range(lookups)])
+    results['conversation_hit'] = metric(seconds / lookups * 1e6, 'us', 'lower')
+    return results
+
+def bench_locust(options):
+    """Locust scenarios, headless against the local mock bridge"""
+    from benchmarks.run_locust import run_locust
+
+    stats = run_locust(users=options.concurrency, duration=options.locust_duration,
+                       latency=options.mock_latency)
+    return {
+        'locust_rps': metric(stats['rps'], 'req/s', 'higher'),
+        'locust_p99': metric(stats['p99_ms'], 'ms', 'lower'),
+        'locust_failures': metric(stats['failures'], 'count', 'lower'),
+    }
+
+BENCHMARKS = {
+    'ingest': bench_ingest,
+    'classify': bench_classify,
+    'api': bench_api,
+    'cache': bench_cache,
+}
+
+def compare(results, baseline, threshold):
+    """Return (name, baseline value, current value, change) for each regression"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if current['better'] == 'higher':
+            change = (previous['value'] - current['value']) / previous['value'] if previous['value'] else 0.0
+        elif previous['value']:
+            change = (current['value'] - previous['value']) / previous['value']
+        else:
+            change = float('inf') if current['value'] > 0 else 0.0
+        if change > threshold:
+            regressions.append((name, previous['value'], current['value'], change))
+    return regressions
+
+def missing(results, baseline, selected):
+    """Baseline metrics that a selected benchmark should have produced but did not"""
+    # Metrics recorded without their benchmark name are always required
+    return sorted(name for name, value in baseline.items()
+                  if name not in results and value.get('benchmark') in (*selected, None))
+
+def selected_benchmarks(options):
+    selected = list(options.only or BENCHMARKS)
+    if options.locust:
+        selected.append('locust')
+    return selected
+
+def run(options):
+    runners = dict(BENCHMARKS, locust=bench_locust)
+
+    results = {}
+    for name in selected_benchmarks(options):
+        logger.info(f"Running {name} benchmark...")
+        try:
+            results.update({metric_name: dict(value, benchmark=name)
+                            for metric_name, value in runners[name](options).items()})
+        except ImportError as e:
+            # Skipped metrics still fail the gate if the baseline has them
+            logger.warning(f"Skipping {name} benchmark: {str(e)}")
+    for name, value in sorted(results.items()):
+        logger.info(f"  {name:<22} {value['value']:>12,.3f} {value['unit']}")
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--only', nargs='+', choices=list(BENCHMARKS))
+    parser.add_argument('--locust', action='store_true', help='also run the Locust scenarios headless')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--output', default=DEFAULT_OUTPUT)
+    parser.add_argument('--save-baseline', action='store_true')
+    parser.add_argument('--threshold', type=float, default=0.2, help='allowed regression, as a fraction')
+    parser.add_argument('--repeats', type=int, default=5)
+    parser.add_argument('--log-mb', type=int, default=8, help='synthetic log size for throughput benchmarks')
+    parser.add_argument('--files', type=int, default=500, help='source files for the scan cache benchmark')
+    parser.add_argument('--concurrency', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=800)
+    parser.add_argument('--mock-latency', type=float, default=0.005)
+    parser.add_argument('--locust-duration', default='30s')
+    options = parser.parse_args()
+
+    results = run(options)
+    os.makedirs(os.path.dirname(os.path.abspath(options.output)), exist_ok=True)
+    with open(options.output, 'w') as f:
+        json.dump(results, f, indent=2, sort_keys=True)
+    logger.info(f"Results saved to: {options.output}")
+
+    if options.save_baseline:
+        with open(options.baseline, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        logger.info(f"Baseline saved to: {options.baseline}")
+        return
+
+    if not os.path.exists(options.baseline):
+        logger.error(f"No baseline at {options.baseline}; run with --save-baseline to create one")
+        sys.exit(1)
+    with open(options.baseline) as f:
+        baseline = json.load(f)
+
+    regressions = compare(results, baseline, options.threshold)
+    for name, previous, current, change in regressions:
+        logger.error(f"Regression in {name}: {previous} -> {current} ({change:+.0%})")
+    absent = missing(results, baseline, selected_benchmarks(options))
+    for name in absent:
+        logger.error(f"Missing result for {name}, which is in the baseline")
+    if regressions or absent:
+        sys.exit(1)
+    logger.info(f"No regressions beyond {options.threshold:.0%}")
+
+if __name__ == "__main__":
+    main()
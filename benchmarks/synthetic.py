@@ -0,0 +1,35 @@
+"""Deterministic synthetic log generators for benchmarks"""
+import json
+import random
+
+LEVELS = ['INFO'] * 8 + ['WARNING', 'ERROR']
+
+def synthetic_lines(count, seed=0):
+    """Text log lines with a realistic level mix"""
+    rng = random.Random(seed)
+    for i in range(count):
+        level = rng.choice(LEVELS)
+        yield (f"2024-01-01T00:00:{i % 60:02d} {level} request {rng.randint(1, 10 ** 6)} "
+               f"handled in {rng.randint(1, 500)}ms by worker {rng.randint(1, 32)}\n")
+
+def synthetic_json_lines(count, seed=0):
+    """JSON log lines in the format the watcher and summarizer expect"""
+    rng = random.Random(seed)
+    for i in range(count):
+        yield json.dumps({
+            "timestamp": f"2024-01-01T00:00:{i % 60:02d}",
+            "level": rng.choice(LEVELS),
+            "message": f"job {rng.randint(1, 10 ** 6)} finished in {rng.randint(1, 500)}ms",
+            "details": {"worker": rng.randint(1, 32)}
+        }) + "\n"
+
+def synthetic_log(size_bytes, seed=0):
+    """A mixed text/JSON log body of roughly `size_bytes`"""
+    rng = random.Random(seed)
+    text, json_lines = synthetic_lines(10 ** 9, seed), synthetic_json_lines(10 ** 9, seed)
+    chunks, total = [], 0
+    while total < size_bytes:
+        line = next(json_lines) if rng.random() < 0.3 else next(text)
+        chunks.append(line)
+        total += len(line)
+    return "".join(chunks)
@@ -0,0 +1,29 @@
+# gunicorn.conf.py
+# Usage: gunicorn -c gunicorn.conf.py api.server:app
+import multiprocessing
+
+bind = "0.0.0.0:5000"
+workers = multiprocessing.cpu_count() * 2 + 1
+
+# Import the app once in the master; workers fork from it copy-on-write.
+# Import must stay light: models and DB handles are created post-fork.
+preload_app = True
+
+def when_ready(server):
+    """Start the one log ingest process; workers read its alerts from SQLite"""
+    from api.ingest import log_dirs_from_env, start_ingest_process
+    log_dirs = log_dirs_from_env()
+    if log_dirs:
+        server.log_ingest = start_ingest_process(log_dirs)
+
+def on_exit(server):
+    from api.ingest import stop_ingest_process
+    if getattr(server, 'log_ingest', None) is not None:
+        stop_ingest_process(server.log_ingest)
+
+def post_fork(server, worker):
+    """Drop any singletons the master created so each worker opens its own"""
+    from ai_bridge.bridge.chat_engine import ChatEngine
+    from api import routes
+    routes.reset_singletons()
+    ChatEngine.reset_all()
@@ -3,8 +3,13 @@ import requests
 import logging
 import json
 import os
+import sys
+import time
 from datetime import datetime
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from findings_store import FindingsStore
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('burp_scan')
 
@@ -69,6 +74,30 @@ class BurpScanner:
         else:
             raise Exception(f"Failed to get scan issues: {response.text}")
     
+    def iter_issues(self, scan_id, page_size=100):
+        """Yield issues one page of scan issue events at a time"""
+        after = 0
+        while True:
+            response = requests.get(
+                f"{self.burp_api_url}/v0.1/scan/{scan_id}",
+                headers=self.headers,
+                params={'after': after, 'issue_events': page_size}
+            )
+            
+            if response.status_code != 200:
+                raise Exception(f"Failed to get scan issues: {response.text}")
+            
+            events = response.json().get('issue_events', [])
+            for event in events:
+                yield event['issue']
+            if len(events) < page_size:
+                break
+            after += len(events)
+    
+    def store_issues(self, scan_id, store):
+        """Stream all issues into the findings store and return the run ID"""
+        return store.record_run('burp', self.iter_issues(scan_id))
+    
     def generate_report(self, scan_id):
         """Generate HTML report for a scan"""
         report_config = {
@@ -123,22 +152,25 @@ def main():
             logger.info(f"Scan progress: {status.get('scan_metrics', {}).get('completed_percentage', 0)}%")
             time.sleep(30)
         
-        # Get issues
-        issues = scanner.get_scan_issues(scan_id)
+        # Store issues
+        store = FindingsStore()
+        scanner.store_issues(scan_id, store)
+        counts = store.diff_counts('burp')
         
         # Generate report
         report_path = scanner.generate_report(scan_id)
         
         # Print summary
         logger.info(f"\nScan completed. Report saved to: {report_path}")
-        logger.info(f"Total issues found: {len(issues)}")
+        logger.info(f"Total issues found: {counts['new'] + counts['unchanged']} "
+                    f"({counts['new']} new, {counts['fixed']} fixed since last run)")
         
         # Print high severity issues
-        high_severity = [i for i in issues if i['severity'] == 'high']
+        high_severity = store.findings(source='burp', severity='high', limit=1000)
         if high_severity:
             logger.warning("\nHigh Severity Issues:")
             for issue in high_severity:
-                logger.warning(f"- {issue['issue_type']}: {issue['url']}")
+                logger.warning(f"- {issue['name']}: {issue['url']}")
                 
     except Exception as e:
         logger.error(f"Scan failed: {str(e)}")
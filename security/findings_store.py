@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import logging
+from datetime import datetime
+
+logger = logging.getLogger('findings_store')
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "reports", "findings.db")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source TEXT NOT NULL,
+    started_at TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS findings (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    fingerprint TEXT NOT NULL,
+    source TEXT NOT NULL,
+    rule TEXT,
+    name TEXT,
+    severity TEXT,
+    url TEXT,
+    param TEXT,
+    detail TEXT,
+    PRIMARY KEY (run_id, fingerprint)
+);
+CREATE INDEX IF NOT EXISTS idx_runs_source ON runs (source, id);
+CREATE INDEX IF NOT EXISTS idx_findings_fingerprint ON findings (fingerprint);
+"""
+
+SEVERITIES = ['High', 'Medium', 'Low', 'Informational']
+
+# Sort key ranking findings by severity rather than alphabetically
+SEVERITY_ORDER = "CASE f.severity {} ELSE {} END".format(
+    " ".join(f"WHEN '{name}' THEN {rank}" for rank, name in enumerate(SEVERITIES)), len(SEVERITIES)
+)
+
+# Row sets of a diff between a source's latest and previous runs. The
+# (run_id, fingerprint) primary key serves every NOT EXISTS lookup.
+DIFF_QUERIES = {
+    'new': """FROM findings f WHERE f.run_id = :latest AND NOT EXISTS (
+        SELECT 1 FROM findings o WHERE o.run_id = :previous AND o.fingerprint = f.fingerprint)""",
+    'fixed': """FROM findings f WHERE f.run_id = :previous AND NOT EXISTS (
+        SELECT 1 FROM findings o WHERE o.run_id = :latest AND o.fingerprint = f.fingerprint)""",
+    'unchanged': """FROM findings f WHERE f.run_id = :latest AND EXISTS (
+        SELECT 1 FROM findings o WHERE o.run_id = :previous AND o.fingerprint = f.fingerprint)""",
+}
+
+def fingerprint(source, rule, url, param):
+    """Stable identity of a finding across runs: (rule, URL, param) per source"""
+    key = "\x1f".join([source, str(rule or ''), str(url or ''), str(param or '')])
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
+
+def _severity(value):
+    value = (value or '').strip().capitalize()
+    if value == 'Info':
+        return 'Informational'
+    return value if value in SEVERITIES else 'Informational'
+
+def normalize_zap_alert(alert):
+    """Map a ZAP core alert onto the normalized finding columns"""
+    return {
+        'rule': alert.get('pluginId') or alert.get('alertRef'),
+        'name': alert.get('name') or alert.get('alert'),
+        'severity': _severity(alert.get('risk')),
+        'url': alert.get('url'),
+        'param': alert.get('param'),
+        'detail': alert
+    }
+
+def normalize_burp_issue(issue):
+    """Map a Burp Suite issue onto the normalized finding columns"""
+    return {
+        'rule': issue.get('type_index') or issue.get('issue_type'),
+        'name': issue.get('name') or issue.get('issue_type'),
+        'severity': _severity(issue.get('severity')),
+        'url': issue.get('url') or f"{issue.get('origin', '')}{issue.get('path', '')}",
+        'param': issue.get('param'),
+        'detail': issue
+    }
+
+def _code_hash(code):
+    """Hash a Bandit code snippet without its line-number gutter or indentation"""
+    lines = [re.sub(r'^\d+\s?', '', line).strip() for line in (code or '').splitlines()]
+    normalized = "\n".join(line for line in lines if line)
+    return hashlib.sha1(normalized.encode('utf-8')).hexdigest()[:16]
+
+def normalize_bandit_result(result):
+    """Map a Bandit JSON result onto the normalized finding columns"""
+    # Keyed on the flagged code rather than its line number, so edits
+    # elsewhere in the file do not turn a finding into new + fixed
+    return {
+        'rule': result.get('test_id'),
+        'name': result.get('test_name') or result.get('issue_text'),
+        'severity': _severity(result.get('issue_severity')),
+        'url': result.get('filename'),
+        'param': f"code:{_code_hash(result.get('code'))}",
+        'detail': result
+    }
+
+NORMALIZERS = {
+    'zap': normalize_zap_alert,
+    'burp': normalize_burp_issue,
+    'bandit': normalize_bandit_result
+}
+
+class FindingsStore:
+    """SQLite-backed table of normalized findings from every scanner run"""
+
+    def __init__(self, db_path=None):
+        self.db_path = db_path or os.getenv('FINDINGS_DB', DEFAULT_DB_PATH)
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def record_run(self, source, items, batch_size=500):
+        """Stream raw scanner output into a new run, batch by batch; returns the run ID"""
+        normalize = NORMALIZERS[source]
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (source, started_at) VALUES (?, ?)",
+                (source, datetime.now().isoformat())
+            )
+            run_id = cursor.lastrowid
+            batch = []
+            count = 0
+            for item in items:
+                batch.append(self._row(run_id, source, normalize(item)))
+                if len(batch) >= batch_size:
+                    count += self._insert(batch)
+                    batch = []
+            count += self._insert(batch)
+        logger.info(f"Stored {count} {source} finding(s) in run {run_id}")
+        return run_id
+
+    def _row(self, run_id, source, finding):
+        param = finding['param']
+        return (
+            run_id,
+            fingerprint(source, finding['rule'], finding['url'], param),
+            source,
+            None if finding['rule'] is None else str(finding['rule']),
+            finding['name'],
+            finding['severity'],
+            finding['url'],
+            None if param is None else str(param),
+            json.dumps(finding['detail'], default=str)
+        )
+
+    def _insert(self, rows):
+        # Duplicate fingerprints within one run (e.g. the same alert on several
+        # evidence strings) collapse into a single finding
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO findings VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows
+        )
+        return len(rows)
+
+    def latest_runs(self, source):
+        """Return the IDs of the latest and previous runs for a source"""
+        rows = self.conn.execute(
+            "SELECT id FROM runs WHERE source = ? ORDER BY id DESC LIMIT 2", (source,)
+        ).fetchall()
+        ids = [r['id'] for r in rows] + [None, None]
+        return ids[0], ids[1]
+
+    def findings(self, source=None, run_id=None, severity=None, limit=100, offset=0):
+        """Page through findings, defaulting to the latest run of each source"""
+        clauses, params = [], []
+        if run_id is not None:
+            clauses.append("f.run_id = ?")
+            params.append(run_id)
+        else:
+            clauses.append("f.run_id IN (SELECT MAX(id) FROM runs GROUP BY source)")
+        if source:
+            clauses.append("f.source = ?")
+            params.append(source)
+        if severity:
+            clauses.append("f.severity = ?")
+            params.append(_severity(severity))
+        rows = self.conn.execute(
+            f"SELECT f.* FROM findings f WHERE {' AND '.join(clauses)} "
+            f"ORDER BY f.source, {SEVERITY_ORDER}, f.url LIMIT ? OFFSET ?",
+            params + [limit, offset]
+        ).fetchall()
+        return [self._as_dict(r) for r in rows]
+
+    def diff(self, source, limit=100, offset=0):
+        """Page through new/fixed/unchanged findings since the source's previous run"""
+        latest, previous = self.latest_runs(source)
+        params = {'latest': latest, 'previous': previous, 'limit': limit, 'offset': offset}
+        result = {'run_id': latest, 'previous_run_id': previous, 'counts': self.diff_counts(source)}
+        for kind, query in DIFF_QUERIES.items():
+            rows = self.conn.execute(
+                f"SELECT f.* {query} ORDER BY {SEVERITY_ORDER}, f.url LIMIT :limit OFFSET :offset", params
+            )
+            result[kind] = [self._as_dict(r) for r in rows]
+        return result
+
+    def diff_counts(self, source):
+        """Number of new/fixed/unchanged findings since the source's previous run"""
+        latest, previous = self.latest_runs(source)
+        params = {'latest': latest, 'previous': previous}
+        return {kind: self.conn.execute(f"SELECT COUNT(*) {query}", params).fetchone()[0]
+                for kind, query in DIFF_QUERIES.items()}
+
+    def summary(self):
+        """Per-source severity counts and diff totals for the dashboard"""
+        summary = {}
+        sources = [r['source'] for r in self.conn.execute("SELECT DISTINCT source FROM runs")]
+        for source in sources:
+            latest, _ = self.latest_runs(source)
+            counts = dict.fromkeys(SEVERITIES, 0)
+            for row in self.conn.execute(
+                "SELECT severity, COUNT(*) AS n FROM findings WHERE run_id = ? GROUP BY severity",
+                (latest,)
+            ):
+                counts[row['severity']] = row['n']
+            summary[source] = dict(self.diff_counts(source), runId=latest, severity=counts)
+        return summary
+
+    def _as_dict(self, row):
+        finding = {k: row[k] for k in ('fingerprint', 'source', 'rule', 'name', 'severity', 'url', 'param')}
+        finding['run_id'] = row['run_id']
+        return finding
@@ -4,15 +4,23 @@ import os
 import logging
 from datetime import datetime
 import concurrent.futures
+import json
+import tempfile
+
+from scan_cache import ScanCache, file_hash
+from findings_store import FindingsStore
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('security_scan')
 
 class SecurityScanner:
-    def __init__(self):
+    def __init__(self, project_root=None, reports_dir=None):
         self.scan_dir = os.path.dirname(os.path.abspath(__file__))
-        self.reports_dir = os.path.join(self.scan_dir, "reports")
+        self.project_root = project_root or os.path.dirname(self.scan_dir)
+        self.reports_dir = reports_dir or os.path.join(self.scan_dir, "reports")
         os.makedirs(self.reports_dir, exist_ok=True)
+        self.cache = ScanCache(self.reports_dir)
+        self.findings = FindingsStore(os.path.join(self.reports_dir, "findings.db"))
     
     def run_zap_scan(self):
         """Run OWASP ZAP scan"""
@@ -40,10 +48,16 @@ class SecurityScanner:
     
     def run_dependency_check(self):
         """Check dependencies for known vulnerabilities"""
+        requirements_path = os.path.join(self.project_root, "requirements.txt")
         try:
+            requirements_hash = file_hash(requirements_path)
+            if self.cache.is_unchanged('requirements', requirements_hash):
+                logger.info("requirements.txt unchanged since last check, skipping dependency check")
+                return True
+            
             logger.info("Running dependency security check...")
             result = subprocess.run(
-                ["safety", "check"],
+                ["safety", "check", "-r", requirements_path],
                 capture_output=True,
                 text=True,
                 check=True
@@ -57,27 +71,41 @@ class SecurityScanner:
             with open(report_path, 'w') as f:
                 f.write(result.stdout)
             
+            self.cache.record('requirements', requirements_hash)
+            self.cache.save()
             logger.info(f"Dependency check completed. Report saved to: {report_path}")
             return True
-        except subprocess.CalledProcessError as e:
+        except (subprocess.CalledProcessError, OSError) as e:
             logger.error(f"Dependency check failed: {str(e)}")
             return False
     
     def run_bandit_scan(self):
-        """Run Bandit static code analysis"""
+        """Run Bandit static code analysis on files changed since the last scan"""
         try:
-            logger.info("Running Bandit static analysis...")
+            sources = self.cache.python_sources(self.project_root)
+            changed, removed = self.cache.diff_sources(sources)
+            results = []
+            
+            if changed:
+                logger.info(f"Running Bandit static analysis on {len(changed)} changed file(s)...")
+                results = self._bandit_results(changed)
+            else:
+                logger.info("No Python sources changed since last scan, reusing Bandit findings")
+            
+            self.cache.update_findings(sources, changed, removed, results)
+            self.cache.save()
+            self.findings.record_run('bandit', self.cache.all_findings())
+            
             report_path = os.path.join(
                 self.reports_dir,
                 f"bandit_report_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
             )
-            
-            subprocess.run([
-                "bandit",
-                "-r", "..",  # Scan entire project
-                "-f", "json",
-                "-o", report_path
-            ], check=True)
+            with open(report_path, 'w') as f:
+                json.dump({
+                    "generated_at": datetime.now().isoformat(),
+                    "rescanned_files": changed,
+                    "results": self.cache.all_findings()
+                }, f, indent=2)
             
             logger.info(f"Bandit scan completed. Report saved to: {report_path}")
             return True
@@ -85,6 +113,28 @@ class SecurityScanner:
             logger.error(f"Bandit scan failed: {str(e)}")
             return False
     
+    def _bandit_results(self, paths):
+        """Run bandit over the given project-relative files and return its results"""
+        fd, output_path = tempfile.mkstemp(suffix=".json")
+        os.close(fd)
+        try:
+            # Bandit exits with 1 when it reports issues, anything else is an error
+            result = subprocess.run(
+                ["bandit", "-f", "json", "-o", output_path] + paths,
+                cwd=self.project_root
+            )
+            if result.returncode not in (0, 1):
+                raise subprocess.CalledProcessError(result.returncode, result.args)
+            
+            with open(output_path) as f:
+                results = json.load(f).get("results", [])
+        finally:
+            os.remove(output_path)
+        
+        for item in results:
+            item["filename"] = os.path.normpath(item["filename"])
+        return results
+    
     def run_all_scans(self):
         """Run all security scans in parallel where possible"""
         with concurrent.futures.ThreadPoolExecutor() as executor:
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+import hashlib
+import json
+import os
+import threading
+import logging
+
+logger = logging.getLogger('scan_cache')
+
+# Directories never worth handing to bandit
+EXCLUDED_DIRS = {'.git', '__pycache__', 'venv', '.venv', 'node_modules',
+                 '.tox', '.nox', '.pytest_cache', 'reports'}
+
+def file_hash(path):
+    """Return the SHA-256 hex digest of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(65536), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class ScanCache:
+    """Content-hash fingerprints and bandit findings persisted between scans"""
+
+    def __init__(self, cache_dir):
+        self.cache_path = os.path.join(cache_dir, "scan_cache.json")
+        self.findings_path = os.path.join(cache_dir, "bandit_findings.json")
+        self._lock = threading.Lock()
+        self.fingerprints = self._load(self.cache_path)
+        self.findings = self._load(self.findings_path)
+
+    def _load(self, path):
+        try:
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _dump(self, data, path):
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, path)
+
+    def save(self):
+        """Atomically write fingerprints and the findings index to disk"""
+        with self._lock:
+            self._dump(self.fingerprints, self.cache_path)
+            self._dump(self.findings, self.findings_path)
+
+    def python_sources(self, root):
+        """Map each project Python file (relative path) to its content hash"""
+        sources = {}
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in EXCLUDED_DIRS]
+            for name in filenames:
+                if name.endswith('.py'):
+                    path = os.path.join(dirpath, name)
+                    sources[os.path.relpath(path, root)] = file_hash(path)
+        return sources
+
+    def diff_sources(self, current):
+        """Return (changed, removed) relative paths against the last scan"""
+        with self._lock:
+            previous = self.fingerprints.get('files', {})
+        changed = sorted(p for p, h in current.items() if previous.get(p) != h)
+        removed = sorted(p for p in previous if p not in current)
+        return changed, removed
+
+    def update_findings(self, current, changed, removed, results):
+        """Merge fresh bandit results for the changed files into the index"""
+        with self._lock:
+            for path in changed + removed:
+                self.findings.pop(path, None)
+            for result in results:
+                self.findings.setdefault(result['filename'], []).append(result)
+            self.fingerprints['files'] = dict(current)
+
+    def all_findings(self):
+        """Return every indexed bandit result, ordered by file and line"""
+        with self._lock:
+            return [r for path in sorted(self.findings) for r in self.findings[path]]
+
+    def is_unchanged(self, key, digest):
+        """Check whether a tracked artifact still has the recorded hash"""
+        with self._lock:
+            return self.fingerprints.get(key) == digest
+
+    def record(self, key, digest):
+        """Record the hash of a tracked artifact after a successful scan"""
+        with self._lock:
+            self.fingerprints[key] = digest
@@ -5,6 +5,9 @@ import sys
 import os
 import logging
 
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from findings_store import FindingsStore
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger('zap_scan')
 
@@ -62,9 +65,21 @@ class ZAPScanner:
         with open(report_path, 'w') as f:
             f.write(self.zap.core.htmlreport())
             
-        # Get alerts
-        alerts = self.zap.core.alerts()
-        return alerts, report_path
+        return report_path
+    
+    def iter_alerts(self, page_size=500):
+        """Yield alerts for the target one API page at a time"""
+        start = 0
+        while True:
+            page = self.zap.core.alerts(baseurl=self.target_url, start=start, count=page_size)
+            yield from page
+            if len(page) < page_size:
+                break
+            start += page_size
+    
+    def store_alerts(self, store):
+        """Stream all alerts into the findings store and return the run ID"""
+        return store.record_run('zap', self.iter_alerts())
 
 def main():
     target_url = "http://localhost:5000"  # AI Bridge API server
@@ -75,14 +90,19 @@ def main():
         scanner.setup_context()
         scanner.spider_target()
         scanner.active_scan()
-        alerts, report_path = scanner.generate_report()
+        report_path = scanner.generate_report()
+        
+        store = FindingsStore()
+        scanner.store_alerts(store)
+        counts = store.diff_counts('zap')
         
         # Print summary
         logger.info(f"\nScan completed. Report saved to: {report_path}")
-        logger.info(f"Total alerts found: {len(alerts)}")
+        logger.info(f"Total alerts found: {counts['new'] + counts['unchanged']} "
+                    f"({counts['new']} new, {counts['fixed']} fixed since last run)")
         
         # Print high-risk findings
-        high_risks = [a for a in alerts if a['risk'] == 'High']
+        high_risks = store.findings(source='zap', severity='High', limit=1000)
         if high_risks:
             logger.warning("\nHigh Risk Findings:")
             for alert in high_risks:
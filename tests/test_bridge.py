@@ -0,0 +1,407 @@
+import pytest
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add project root to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ai_bridge.bridge.chat_engine import (PROVIDERS, ChatEngine, ChatMessage, ProviderTimeout,
+                                          load_provider, register_provider, _loaded_providers)
+from ai_bridge.bridge.memory import Conversation, ConversationStore
+from ai_bridge.bridge.alert_store import AlertStore
+from ai_bridge.bridge.anomaly import AnomalyDetector, log_template
+from benchmarks.bench_importtime import measure_import
+from benchmarks import suite
+
+try:
+    from ai_bridge.bridge import watcher
+except ImportError:
+    watcher = None
+
+try:
+    from ai_bridge.bridge.openai_provider import OpenAIProvider, _retry_after_seconds
+except ImportError:
+    OpenAIProvider = None
+
+needs_watchdog = pytest.mark.skipif(watcher is None, reason="watchdog not installed")
+needs_openai = pytest.mark.skipif(OpenAIProvider is None, reason="openai not installed")
+
+@needs_openai
+def test_retry_after_parsing():
+    assert _retry_after_seconds("2") == 2.0
+    assert _retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert _retry_after_seconds(None) is None
+    assert _retry_after_seconds("soon") is None
+
+@needs_openai
+def test_backoff_respects_retry_after():
+    provider = OpenAIProvider("test_key", backoff_base=0.1, backoff_cap=1.0)
+    for attempt in range(6):
+        assert 0 <= provider._backoff(attempt) <= 1.0
+    assert provider._backoff(0, retry_after=3.0) == 3.0
+
+@needs_openai
+def test_openai_options_from_config():
+    engine = ChatEngine({"mode": "openai", "openai_api_key": "test_key", "openai_timeout": 10.0,
+                         "openai_hedge_after": 0.2, "openai_max_concurrency": 4, "openai_max_retries": 1})
+    provider = engine.provider
+    assert (provider.timeout, provider.hedge_after, provider.max_concurrency, provider.max_retries) == (10.0, 0.2, 4, 1)
+    assert provider.max_connections == 20
+
+@needs_openai
+def test_hedged_request_wins_over_slow_primary():
+    provider = OpenAIProvider("test_key", hedge_after=0.05)
+    delays = [1.0, 0.01]
+
+    async def fake_request(payload, deadline, kwargs):
+        await asyncio.sleep(delays.pop(0))
+        return f"reply after {len(delays)}"
+
+    provider._with_retries = fake_request
+    try:
+        start = time.monotonic()
+        reply = asyncio.run(provider.generate([ChatMessage("user", "Test prompt")]))
+        assert reply == "reply after 0"
+        assert time.monotonic() - start < 0.5
+    finally:
+        provider.close()
+
+@needs_openai
+def test_deadline_exceeded():
+    provider = OpenAIProvider("test_key", timeout=0.0)
+    try:
+        with pytest.raises(ProviderTimeout):
+            asyncio.run(provider.generate([ChatMessage("user", "Test prompt")]))
+    finally:
+        provider.close()
+
+@needs_openai
+def test_rate_limited_request_is_retried():
+    import httpx
+    import openai
+    from types import SimpleNamespace
+
+    provider = OpenAIProvider("test_key", backoff_base=0.01)
+    calls = []
+
+    async def create(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == 1:
+            response = httpx.Response(429, headers={"retry-after": "0"},
+                                      request=httpx.Request("POST", "http://test/chat/completions"))
+            raise openai.APIStatusError("Rate limit reached", response=response, body=None)
+        message = SimpleNamespace(content="Recovered reply")
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+    try:
+        provider._state().client.chat.completions.create = create
+        # Requests from separate event loops share the one pooled client
+        for _ in range(2):
+            calls.clear()
+            reply = asyncio.run(provider.generate([ChatMessage("user", "Test prompt")]))
+            assert reply == "Recovered reply"
+            assert len(calls) == 2
+    finally:
+        provider.close()
+
+def test_conversation_compacts_within_budget():
+    conversation = Conversation(system_prompt="You are a log analyst.", max_tokens=100,
+                                token_counter=lambda text: len(text.split()))
+    for i in range(50):
+        conversation.add(ChatMessage("user", f"message number {i} with some words"))
+        assert conversation.token_count <= 100
+
+    prompt = conversation.messages()
+    assert prompt[0].content == "You are a log analyst."
+    assert "Summary of earlier conversation" in prompt[1].content
+    assert prompt[-1].content == "message number 49 with some words"
+
+def test_conversation_prefix_stable_between_compactions():
+    conversation = Conversation(max_tokens=100, token_counter=lambda text: len(text.split()))
+    prefixes = []
+    for i in range(40):
+        conversation.add(ChatMessage("user", f"message number {i} with some words"))
+        prefixes.append(conversation.summary)
+    # Compaction frees a quarter of the budget, so the summary changes in steps
+    assert len(set(prefixes)) < len(prefixes) / 2
+
+def test_conversation_store_lru_eviction():
+    store = ConversationStore(max_sessions=2)
+    first = store.get("a")
+    store.get("b")
+    assert store.get("a") is first
+    store.get("c")
+    assert len(store) == 2
+    assert store.get("a") is first
+    assert store.get("b") is not None and len(store) == 2
+
+def test_conversation_store_idle_eviction():
+    store = ConversationStore(idle_timeout=60)
+    store.get("idle").last_active -= 120
+    store.get("active")
+    assert len(store) == 1
+
+class EchoProvider:
+    @classmethod
+    def from_config(cls, config):
+        return cls()
+
+    async def generate(self, messages, **kwargs):
+        return messages[-1].content
+
+@pytest.fixture
+def echo_provider():
+    register_provider("echo", f"{__name__}:EchoProvider")
+    yield EchoProvider
+    PROVIDERS.pop("echo", None)
+    _loaded_providers.pop("echo", None)
+
+def test_chat_sessions_keep_budgeted_history():
+    engine = ChatEngine({"mode": "echo", "context_tokens": 64, "system_prompt": "Be brief."})
+    prompts = []
+
+    class RecordingProvider(EchoProvider):
+        async def generate(self, messages, **kwargs):
+            prompts.append(messages)
+            return await super().generate(messages, **kwargs)
+
+    engine._provider = RecordingProvider()
+    for i in range(30):
+        assert asyncio.run(engine.chat(f"question {i} about the logs", session_id="s1")) == f"question {i} about the logs"
+    asyncio.run(engine.chat("unrelated", session_id="s2"))
+
+    assert prompts[1][0].content == "Be brief."
+    assert [m.content for m in prompts[1][1:]] == ["question 0 about the logs", "question 0 about the logs",
+                                                  "question 1 about the logs"]
+    assert engine.conversations.get("s1").token_count <= 64
+    assert "Summary of earlier conversation" in prompts[29][1].content
+    assert len(prompts[-1]) == 2
+
+def test_failed_chat_leaves_no_orphaned_turn():
+    engine = ChatEngine({"mode": "echo"})
+    engine._provider = EchoProvider()
+    asyncio.run(engine.chat("first", session_id="s1"))
+
+    class FailingProvider:
+        async def generate(self, messages, **kwargs):
+            raise ProviderTimeout("too slow")
+
+    engine._provider = FailingProvider()
+    with pytest.raises(ProviderTimeout):
+        asyncio.run(engine.chat("lost", session_id="s1"))
+    assert [m.role for m in engine.conversations.get("s1").messages()] == ["user", "assistant"]
+
+def test_provider_sdks_load_lazily():
+    _, _, loaded = measure_import("ai_bridge.bridge.chat_engine")
+    assert loaded == []
+
+def test_provider_registry(echo_provider):
+    with pytest.raises(ValueError):
+        load_provider("invalid_mode")
+    assert all(not target.startswith("ai_bridge.bridge.chat_engine:")
+               for target in PROVIDERS.values() if isinstance(target, str))
+
+    engine = ChatEngine({"mode": "echo"})
+    assert isinstance(engine.provider, EchoProvider)
+    ChatEngine.reset_all()
+    assert engine._provider is None
+
+@needs_openai
+def test_switch_provider(echo_provider):
+    engine = ChatEngine({"mode": "openai", "openai_api_key": "test_key"})
+    assert isinstance(engine.provider, OpenAIProvider)
+    engine.switch_provider("echo")
+    assert engine.config.mode == "echo"
+    assert isinstance(engine.provider, EchoProvider)
+
+@pytest.fixture
+def temp_log_dir():
+    with tempfile.TemporaryDirectory() as tmpdirname:
+        yield tmpdirname
+
+@needs_watchdog
+def test_parse_line():
+    record = watcher.parse_line("app.log", '{"level": "error", "message": "disk full"}')
+    assert (record['level'], record['message']) == ("ERROR", "disk full")
+    assert watcher.parse_line("app.log", "2024-01-01 WARN slow query")['level'] == "WARNING"
+    assert watcher.parse_line("app.log", '{"level": "warn", "message": "slow query"}')['level'] == "WARNING"
+    assert watcher.parse_line("app.log", '{"level": "fatal", "message": "out of memory"}')['level'] == "CRITICAL"
+
+@needs_watchdog
+def test_tail_reader_returns_complete_lines(temp_log_dir):
+    log_file = Path(temp_log_dir) / "app.log"
+    log_file.write_text("first\nsecond")
+    reader = watcher.TailReader(str(log_file))
+    assert reader.read()[0] == ["first"]
+
+    with open(log_file, 'a') as f:
+        f.write(" half\nthird\n")
+    assert reader.read()[0] == ["second half", "third"]
+
+    log_file.write_text("rotated\n")
+    assert reader.read()[0] == ["rotated"]
+
+@needs_watchdog
+def test_sharded_watcher(temp_log_dir):
+    directories = [os.path.join(temp_log_dir, f"service{i}") for i in range(6)]
+    for directory in directories:
+        os.makedirs(directory)
+
+    received = []
+    sharded = watcher.ShardedWatcher(directories, received.extend, shards=3, flush_interval=0.05)
+    assert sorted(p for paths in sharded.assignments for p in paths) == sorted(directories)
+
+    sharded.start()
+    try:
+        time.sleep(0.5)
+        for directory in directories:
+            with open(os.path.join(directory, "app.log"), 'w') as f:
+                f.write("INFO started\nERROR failed\n")
+
+        deadline = time.time() + 10
+        while len(received) < 12 and time.time() < deadline:
+            time.sleep(0.05)
+    finally:
+        sharded.stop()
+
+    assert len(received) == 12
+    assert sum(record['level'] == "ERROR" for record in received) == 6
+    assert sum(shard['records'] for shard in sharded.stats()) == 12
+    assert not sharded.is_running()
+
+def steady_traffic(detector, windows, start=0.0):
+    """Feed `windows` 1-second windows of normal traffic, ending at the returned time"""
+    now = start
+    for window in range(windows):
+        for i in range(50):
+            detector.observe([{'level': 'INFO', 'message': f"request {i} handled in {i * 3}ms"}], now=now)
+            now += 0.02
+        detector.observe([{'level': 'ERROR', 'message': f"timeout after {window}s"}], now=now - 0.01)
+    return now
+
+def test_log_template():
+    assert log_template("user 42 logged in from 10.0.0.1") == log_template("user 7 logged in from 10.1.2.3")
+
+def test_error_spike_raises_alert():
+    detector = AnomalyDetector(interval=1.0, warmup=5)
+    now = steady_traffic(detector, 20)
+    detector.tick(now)
+    assert detector.recent_alerts() == []
+
+    detector.observe([{'level': 'ERROR', 'message': f"database connection {i} refused"} for i in range(200)],
+                     now=now + 0.1)
+    detector.tick(now + 1.5)
+
+    kinds = {alert.series for alert in detector.recent_alerts()}
+    assert {"level:ERROR", "error_rate"} <= kinds
+    assert any(alert.kind == 'template' for alert in detector.recent_alerts())
+    event = detector.recent_alerts()[0].to_event()
+    assert event['status'] == 'danger'
+    assert set(event) == {'time', 'type', 'message', 'status'}
+
+def test_fatal_burst_raises_error_rate():
+    detector = AnomalyDetector(interval=1.0, warmup=5)
+    now = steady_traffic(detector, 20)
+    detector.observe([{'level': 'fatal', 'message': f"worker {i} crashed"} for i in range(150)]
+                     + [{'level': 'CRITICAL', 'message': "out of memory"}] * 150, now=now + 0.1)
+    detector.tick(now + 1.5)
+    kinds = {alert.series for alert in detector.recent_alerts()}
+    assert {"level:CRITICAL", "error_rate"} <= kinds
+
+def test_unknown_levels_not_counted_as_info():
+    detector = AnomalyDetector(interval=1.0, warmup=5)
+    now = steady_traffic(detector, 10)
+    detector.tick(now)
+    mean = detector.level_rates['INFO'].mean
+    detector.observe([{'level': 'NOTICE', 'message': "backup finished"}] * 500, now=now + 0.1)
+    detector.tick(now + 1.5)
+    assert detector.unknown_levels == {'NOTICE': 500}
+    assert detector.level_rates['INFO'].mean <= mean
+    assert not any(alert.series == "level:INFO" for alert in detector.recent_alerts())
+
+def test_detector_disabled():
+    detector = AnomalyDetector(interval=1.0, warmup=0)
+    detector.enabled = False
+    detector.observe([{'level': 'ERROR', 'message': "boom"}] * 500, now=0.0)
+    detector.tick(5.0)
+    assert detector.recent_alerts() == []
+
+def test_disabled_detector_keeps_baselines():
+    detector = AnomalyDetector(interval=1.0, warmup=5)
+    now = steady_traffic(detector, 10)
+    detector.tick(now)
+    mean = detector.level_rates['INFO'].mean
+
+    detector.enabled = False
+    detector.tick(now + 60)
+    assert detector.level_rates['INFO'].mean == mean
+
+    detector.enabled = True
+    steady_traffic(detector, 3, start=now + 60)
+    assert detector.level_rates['INFO'].mean == pytest.approx(mean, rel=0.1)
+    assert detector.recent_alerts() == []
+
+def test_alert_store_shared_between_processes(tmp_path):
+    db_path = str(tmp_path / "alerts.db")
+    ingest, worker = AlertStore(db_path), AlertStore(db_path)
+    detector = AnomalyDetector(interval=1.0, warmup=5)
+    detector.listeners.append(ingest.record)
+    now = steady_traffic(detector, 20)
+    detector.observe([{'level': 'ERROR', 'message': f"disk {i} full"} for i in range(200)], now=now + 0.1)
+    detector.tick(now + 1.5)
+
+    assert [a.message for a in worker.recent(100)] == [a.message for a in detector.recent_alerts(100)]
+    assert worker.recent()[0].to_event() == detector.recent_alerts()[0].to_event()
+
+    assert worker.alerts_enabled(default=True) is True
+    worker.set_alerts_enabled(False)
+    assert ingest.alerts_enabled(default=True) is False
+    ingest.close()
+    worker.close()
+
+def test_benchmark_regression_gate():
+    baseline = {
+        'watcher_ingest': suite.metric(100.0, 'MB/s', 'higher'),
+        'chat_p99': suite.metric(50.0, 'ms', 'lower'),
+        'locust_failures': suite.metric(0, 'count', 'lower'),
+    }
+    results = {
+        'watcher_ingest': suite.metric(90.0, 'MB/s', 'higher'),
+        'chat_p99': suite.metric(70.0, 'ms', 'lower'),
+        'locust_failures': suite.metric(0, 'count', 'lower'),
+        'scan_cache_hit': suite.metric(5.0, 'ms', 'lower'),
+    }
+    regressions = suite.compare(results, baseline, threshold=0.2)
+    assert [name for name, *_ in regressions] == ["chat_p99"]
+
+    results['locust_failures'] = suite.metric(3, 'count', 'lower')
+    assert len(suite.compare(results, baseline, threshold=0.2)) == 2
+
+def test_benchmark_gate_requires_selected_metrics():
+    baseline = {
+        'watcher_ingest': dict(suite.metric(100.0, 'MB/s', 'higher'), benchmark='ingest'),
+        'locust_p99': dict(suite.metric(80.0, 'ms', 'lower'), benchmark='locust'),
+        'chat_p99': suite.metric(50.0, 'ms', 'lower'),
+    }
+    results = {'watcher_ingest': suite.metric(100.0, 'MB/s', 'higher')}
+    assert suite.missing(results, baseline, ['ingest', 'api']) == ['chat_p99']
+    assert suite.missing({}, baseline, ['ingest', 'locust']) == ['chat_p99', 'locust_p99', 'watcher_ingest']
+
+def test_benchmark_gate_fails_without_baseline(tmp_path, monkeypatch):
+    monkeypatch.setattr(suite, 'run', lambda options: {})
+    monkeypatch.setattr(sys, 'argv', ['suite.py', '--baseline', str(tmp_path / "baseline.json"),
+                                      '--output', str(tmp_path / "latest.json")])
+    with pytest.raises(SystemExit) as exit_info:
+        suite.main()
+    assert exit_info.value.code == 1
+
+def test_benchmark_cache_hits_run_offline():
+    options = argparse.Namespace(repeats=1, files=20)
+    results = suite.bench_cache(options)
+    assert set(results) == {'scan_cache_hit', 'conversation_hit'}
+    assert all(value['value'] > 0 for value in results.values())
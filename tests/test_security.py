@@ -0,0 +1,187 @@
+import unittest
+import json
+import tempfile
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+import sys
+import os
+
+# Security scripts run standalone, so import them from their own directory
+sys.path.append(os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'security'))
+
+from scan_cache import ScanCache
+from findings_store import FindingsStore
+import run_security_scans
+
+def fake_bandit(findings):
+    """Build a subprocess.run stand-in that writes bandit JSON for the given files"""
+    calls = []
+    def run(cmd, cwd=None, **kwargs):
+        calls.append(cmd)
+        output_path = cmd[cmd.index("-o") + 1]
+        files = cmd[cmd.index("-o") + 2:]
+        with open(output_path, 'w') as f:
+            json.dump({"results": [{"filename": p, "test_id": findings[p]}
+                                   for p in files if p in findings]}, f)
+        return MagicMock(returncode=1 if files else 0, args=cmd)
+    run.calls = calls
+    return run
+
+class TestScanCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        (self.root / "app.py").write_text("import pickle\n")
+        (self.root / "util.py").write_text("x = 1\n")
+        self.cache = ScanCache(self.tmp.name)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_diff_sources(self):
+        sources = self.cache.python_sources(self.root)
+        changed, removed = self.cache.diff_sources(sources)
+        self.assertEqual(changed, ["app.py", "util.py"])
+
+        self.cache.update_findings(sources, changed, removed, [])
+        (self.root / "util.py").write_text("x = 2\n")
+        (self.root / "app.py").unlink()
+        changed, removed = self.cache.diff_sources(self.cache.python_sources(self.root))
+        self.assertEqual(changed, ["util.py"])
+        self.assertEqual(removed, ["app.py"])
+
+    def test_findings_persist(self):
+        sources = self.cache.python_sources(self.root)
+        self.cache.update_findings(sources, ["app.py", "util.py"], [],
+                                   [{"filename": "app.py", "test_id": "B403"}])
+        self.cache.record("requirements", "abc")
+        self.cache.save()
+
+        reloaded = ScanCache(self.tmp.name)
+        self.assertEqual(len(reloaded.all_findings()), 1)
+        self.assertTrue(reloaded.is_unchanged("requirements", "abc"))
+        self.assertEqual(reloaded.diff_sources(sources), ([], []))
+
+class TestIncrementalScans(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        (self.root / "app.py").write_text("import pickle\n")
+        (self.root / "util.py").write_text("x = 1\n")
+        (self.root / "requirements.txt").write_text("flask==3.0.0\n")
+        self.scanner = run_security_scans.SecurityScanner(project_root=self.tmp.name,
+                                                          reports_dir=self.tmp.name)
+
+    def tearDown(self):
+        self.scanner.findings.close()
+        self.tmp.cleanup()
+
+    def test_bandit_rescans_only_changed_files(self):
+        run = fake_bandit({"app.py": "B403"})
+        with patch('run_security_scans.subprocess.run', side_effect=run):
+            self.assertTrue(self.scanner.run_bandit_scan())
+            self.assertTrue(self.scanner.run_bandit_scan())
+            (self.root / "util.py").write_text("x = 2\n")
+            self.assertTrue(self.scanner.run_bandit_scan())
+
+        self.assertEqual(len(run.calls), 2)
+        self.assertEqual(run.calls[1][-1:], ["util.py"])
+        findings = self.scanner.cache.all_findings()
+        self.assertEqual([f["test_id"] for f in findings], ["B403"])
+        self.assertEqual(self.scanner.findings.summary()['bandit']['unchanged'], 1)
+
+    @patch('run_security_scans.subprocess.run')
+    def test_dependency_check_skipped_when_unchanged(self, mock_run):
+        mock_run.return_value.stdout = "No known security vulnerabilities found."
+        self.assertTrue(self.scanner.run_dependency_check())
+        self.assertTrue(self.scanner.run_dependency_check())
+        self.assertEqual(mock_run.call_count, 1)
+
+        (self.root / "requirements.txt").write_text("flask==3.0.1\n")
+        self.assertTrue(self.scanner.run_dependency_check())
+        self.assertEqual(mock_run.call_count, 2)
+
+    @patch('run_security_scans.subprocess.run')
+    def test_dependency_check_fails_without_requirements(self, mock_run):
+        (self.root / "requirements.txt").unlink()
+        self.assertFalse(self.scanner.run_dependency_check())
+        mock_run.assert_not_called()
+
+class TestFindingsStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = FindingsStore(os.path.join(self.tmp.name, "findings.db"))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def zap_alert(self, plugin_id, url, param="", risk="Medium"):
+        return {"pluginId": plugin_id, "name": f"Alert {plugin_id}", "risk": risk,
+                "url": url, "param": param}
+
+    def test_diff_across_runs(self):
+        self.store.record_run('zap', [
+            self.zap_alert("10020", "http://localhost:5000/"),
+            self.zap_alert("40012", "http://localhost:5000/chat", "prompt", "High"),
+        ])
+        self.store.record_run('zap', [
+            self.zap_alert("40012", "http://localhost:5000/chat", "prompt", "High"),
+            self.zap_alert("10038", "http://localhost:5000/status"),
+        ])
+
+        diff = self.store.diff('zap')
+        self.assertEqual([f['rule'] for f in diff['new']], ["10038"])
+        self.assertEqual([f['rule'] for f in diff['fixed']], ["10020"])
+        self.assertEqual([f['rule'] for f in diff['unchanged']], ["40012"])
+
+    def test_diff_counts_and_paging(self):
+        self.store.record_run('zap', [self.zap_alert(str(i), "http://localhost:5000/") for i in range(5)])
+        self.store.record_run('zap', [self.zap_alert(str(i), "http://localhost:5000/") for i in range(2, 9)])
+
+        self.assertEqual(self.store.diff_counts('zap'), {'new': 4, 'fixed': 2, 'unchanged': 3})
+        page = self.store.diff('zap', limit=2, offset=2)
+        self.assertEqual((len(page['new']), len(page['fixed']), len(page['unchanged'])), (2, 0, 1))
+        self.assertEqual(page['counts']['new'], 4)
+        self.assertEqual(self.store.summary()['zap']['new'], 4)
+
+    def test_findings_sorted_by_severity(self):
+        risks = ["Low", "Informational", "High", "Medium"]
+        self.store.record_run('zap', [self.zap_alert(str(i), "http://localhost:5000/", risk=risk)
+                                      for i, risk in enumerate(risks)])
+        expected = ["High", "Medium", "Low", "Informational"]
+        self.assertEqual([f['severity'] for f in self.store.findings(source='zap')], expected)
+        self.assertEqual([f['severity'] for f in self.store.diff('zap')['new']], expected)
+
+    def test_bandit_fingerprint_ignores_line_shifts(self):
+        def result(line):
+            return {"test_id": "B301", "issue_severity": "MEDIUM", "filename": "app.py",
+                    "line_number": line, "code": f"{line} data = pickle.loads(blob)\n"}
+
+        self.store.record_run('bandit', [result(10)])
+        self.store.record_run('bandit', [result(11)])
+        self.assertEqual(self.store.diff_counts('bandit'), {'new': 0, 'fixed': 0, 'unchanged': 1})
+
+    def test_duplicate_alerts_collapse(self):
+        alert = self.zap_alert("10020", "http://localhost:5000/")
+        self.store.record_run('zap', [alert, dict(alert, evidence="other")], batch_size=1)
+        self.assertEqual(len(self.store.findings(source='zap')), 1)
+
+    def test_normalized_sources(self):
+        self.store.record_run('burp', [{"name": "SQL injection", "type_index": 1049088,
+                                        "severity": "high", "origin": "http://localhost:5000",
+                                        "path": "/chat"}])
+        self.store.record_run('bandit', [{"test_id": "B301", "test_name": "pickle",
+                                          "issue_severity": "MEDIUM", "filename": "app.py",
+                                          "line_number": 3}])
+
+        high = self.store.findings(severity='high')
+        self.assertEqual(len(high), 1)
+        self.assertEqual(high[0]['url'], "http://localhost:5000/chat")
+
+        summary = self.store.summary()
+        self.assertEqual(summary['bandit']['severity']['Medium'], 1)
+        self.assertEqual(summary['burp']['new'], 1)
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)